@@ -212,7 +212,7 @@ class JobView(BaseModel):
     viewer_id: Optional[str] = None
     viewer_ip: Optional[str] = None
     source: Optional[str] = None  # direct, search, referral, email
-    viewed_at: str
+    viewed_at: datetime
 
 
 class JobCreate(BaseModel):
@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import uuid
+from utils.ids import new_id
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 
@@ -103,16 +103,17 @@ def get_candidate_router(db, get_current_user):
         if existing:
             raise HTTPException(status_code=400, detail="Candidate profile already exists")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         candidate_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             **candidate.dict(),
             "certifications": [],
             "job_preferences": {},
             "visibility_settings": {"public": True},
             "parsed_resume_data": {},
             "overall_score": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.candidates.insert_one(candidate_doc)
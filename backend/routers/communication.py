@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import uuid
+from utils.ids import new_id
 
 router = APIRouter(prefix="/communication", tags=["Communication"])
 
@@ -92,8 +92,9 @@ def get_communication_router(db, get_current_user):
         if not recipient:
             raise HTTPException(status_code=404, detail="Recipient not found")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         message_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "sender_id": current_user["id"],
             "sender_name": current_user.get("full_name"),
             "recipient_id": message.recipient_id,
@@ -109,20 +110,20 @@ def get_communication_router(db, get_current_user):
             "replied_to_message_id": None,
             "priority": message.priority,
             "expires_at": None,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso
         }
         
         await db.messages.insert_one(message_doc)
         
         # Create notification
         await db.notifications.insert_one({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "user_id": message.recipient_id,
             "notification_type": "new_message",
             "title": "New Message",
             "message": f"You have a new message from {current_user.get('full_name', 'Someone')}",
             "is_read": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso
         })
         
         return message_doc
@@ -185,12 +186,13 @@ def get_communication_router(db, get_current_user):
         
         # Mark as read if recipient
         if message["recipient_id"] == current_user["id"] and not message["is_read"]:
+            now_iso = datetime.now(timezone.utc).isoformat()
             await db.messages.update_one(
                 {"id": message_id},
-                {"$set": {"is_read": True, "read_at": datetime.now(timezone.utc).isoformat()}}
+                {"$set": {"is_read": True, "read_at": now_iso}}
             )
             message["is_read"] = True
-            message["read_at"] = datetime.now(timezone.utc).isoformat()
+            message["read_at"] = now_iso
         
         return message
     
@@ -210,7 +212,7 @@ def get_communication_router(db, get_current_user):
         recipient = await db.users.find_one({"id": recipient_id}, {"_id": 0, "full_name": 1})
         
         reply_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "sender_id": current_user["id"],
             "sender_name": current_user.get("full_name"),
             "recipient_id": recipient_id,
@@ -248,13 +250,14 @@ def get_communication_router(db, get_current_user):
         if existing:
             raise HTTPException(status_code=400, detail="Template name already exists")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         template_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             **template.dict(),
             "is_active": True,
             "created_by": current_user["id"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.email_templates.insert_one(template_doc)
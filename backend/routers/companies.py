@@ -7,7 +7,8 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import uuid
+from utils.ids import new_id
+import asyncio
 
 router = APIRouter(prefix="/companies", tags=["Companies"])
 
@@ -93,13 +94,14 @@ def get_company_router(db, get_current_user):
         if current_user["role"] not in ["admin", "super_admin"]:
             raise HTTPException(status_code=403, detail="Admin access required")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         company_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             **company.dict(exclude_none=True),
             "is_active": True,
             "settings": {},
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.companies.insert_one(company_doc)
@@ -199,14 +201,33 @@ def get_company_router(db, get_current_user):
         current_user: dict = Depends(get_current_user)
     ):
         """Get company statistics"""
-        # Count jobs
-        total_jobs = await db.jobs.count_documents({"company_id": company_id})
-        active_jobs = await db.jobs.count_documents({"company_id": company_id, "job_status": "published"})
+        # Applications carry company_id, so no job-id round trip; both
+        # collections are counted in one pass each, concurrently
+        job_counts, application_counts = await asyncio.gather(
+            db.jobs.aggregate([
+                {"$match": {"company_id": company_id}},
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "active": {"$sum": {"$cond": [{"$eq": ["$job_status", "published"]}, 1, 0]}}
+                }}
+            ]).to_list(1),
+            db.applications.aggregate([
+                {"$match": {"company_id": company_id}},
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "hired": {"$sum": {"$cond": [{"$eq": ["$application_status", "hired"]}, 1, 0]}}
+                }}
+            ]).to_list(1)
+        )
+        job_counts = job_counts[0] if job_counts else {}
+        application_counts = application_counts[0] if application_counts else {}
         
-        # Count applications
-        job_ids = await db.jobs.distinct("id", {"company_id": company_id})
-        total_applications = await db.applications.count_documents({"job_id": {"$in": job_ids}})
-        hired = await db.applications.count_documents({"job_id": {"$in": job_ids}, "application_status": "hired"})
+        total_jobs = job_counts.get("total", 0)
+        active_jobs = job_counts.get("active", 0)
+        total_applications = application_counts.get("total", 0)
+        hired = application_counts.get("hired", 0)
         
         return {
             "company_id": company_id,
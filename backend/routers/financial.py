@@ -7,7 +7,9 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
-import uuid
+import secrets
+from utils.ids import new_id
+from services.cache_service import cache_manager, CacheKeys
 
 router = APIRouter(prefix="/financial", tags=["Financial"])
 
@@ -140,8 +142,10 @@ def get_financial_router(db, get_current_user, commission_calculator):
         # Get user name
         user = await db.users.find_one({"id": commission.user_id}, {"_id": 0, "full_name": 1})
         
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
         commission_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "referral_id": commission.referral_id,
             "application_id": commission.application_id,
             "user_id": commission.user_id,
@@ -161,11 +165,11 @@ def get_financial_router(db, get_current_user, commission_calculator):
             "net_commission": calc_result["calculation_details"]["net_commission"],
             "currency": "INR",
             "commission_status": "pending",
-            "earned_date": datetime.now(timezone.utc).isoformat(),
-            "payment_due_date": (datetime.now(timezone.utc) + timedelta(days=30)).isoformat(),
+            "earned_date": now_iso,
+            "payment_due_date": (now + timedelta(days=30)).isoformat(),
             "notes": commission.notes,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.commissions.insert_one(commission_doc)
@@ -235,12 +239,13 @@ def get_financial_router(db, get_current_user, commission_calculator):
         if new_status not in valid_statuses:
             raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         result = await db.commissions.update_one(
             {"id": commission_id},
             {"$set": {
                 "commission_status": new_status,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-                "payment_date": datetime.now(timezone.utc).isoformat() if new_status == "paid" else None
+                "updated_at": now_iso,
+                "payment_date": now_iso if new_status == "paid" else None
             }}
         )
         
@@ -263,8 +268,9 @@ def get_financial_router(db, get_current_user, commission_calculator):
         # Get payee name
         payee = await db.users.find_one({"id": payment.payee_id}, {"_id": 0, "full_name": 1})
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         payment_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "payer_id": None,  # Platform
             "payer_name": "HiringReferrals",
             "payee_id": payment.payee_id,
@@ -285,8 +291,8 @@ def get_financial_router(db, get_current_user, commission_calculator):
             "net_amount": payment.amount,
             "bank_reference": None,
             "metadata": {},
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.payments.insert_one(payment_doc)
@@ -329,13 +335,14 @@ def get_financial_router(db, get_current_user, commission_calculator):
             raise HTTPException(status_code=404, detail="Payment not found")
         
         # Simulate payment processing
+        now_iso = datetime.now(timezone.utc).isoformat()
         await db.payments.update_one(
             {"id": payment_id},
             {"$set": {
                 "payment_status": "completed",
-                "gateway_transaction_id": transaction_id or f"TXN_{uuid.uuid4().hex[:12].upper()}",
-                "payment_date": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "gateway_transaction_id": transaction_id or f"TXN_{secrets.token_hex(6).upper()}",
+                "payment_date": now_iso,
+                "updated_at": now_iso
             }}
         )
         
@@ -345,7 +352,7 @@ def get_financial_router(db, get_current_user, commission_calculator):
                 {"id": payment["related_entity_id"]},
                 {"$set": {
                     "commission_status": "paid",
-                    "payment_date": datetime.now(timezone.utc).isoformat()
+                    "payment_date": now_iso
                 }}
             )
         
@@ -376,8 +383,9 @@ def get_financial_router(db, get_current_user, commission_calculator):
         count = await db.invoices.count_documents({})
         invoice_number = f"INV-{datetime.now().strftime('%Y%m')}-{count + 1:04d}"
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         invoice_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "invoice_number": invoice_number,
             "company_id": invoice.company_id,
             "company_name": company.get("name"),
@@ -397,11 +405,12 @@ def get_financial_router(db, get_current_user, commission_calculator):
             "payment_terms": invoice.payment_terms,
             "notes": invoice.notes,
             "pdf_url": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.invoices.insert_one(invoice_doc)
+        cache_manager.invalidate_list(CacheKeys.INVOICES)
         return invoice_doc
     
     @router.get("/invoices", response_model=List[InvoiceResponse])
@@ -450,9 +459,10 @@ def get_financial_router(db, get_current_user, commission_calculator):
                 "invoice_status": "sent",
                 "issued_date": issued_date.isoformat(),
                 "due_date": due_date.isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "updated_at": issued_date.isoformat()
             }}
         )
+        cache_manager.invalidate_list(CacheKeys.INVOICES)
         
         return {"status": "sent", "invoice_id": invoice_id, "due_date": due_date.isoformat()}
     
@@ -465,14 +475,16 @@ def get_financial_router(db, get_current_user, commission_calculator):
         if current_user["role"] not in ["admin", "super_admin"]:
             raise HTTPException(status_code=403, detail="Admin access required")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         result = await db.invoices.update_one(
             {"id": invoice_id},
             {"$set": {
                 "invoice_status": "paid",
-                "paid_date": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "paid_date": now_iso,
+                "updated_at": now_iso
             }}
         )
+        cache_manager.invalidate_list(CacheKeys.INVOICES)
         
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail="Invoice not found")
@@ -507,8 +519,9 @@ def get_financial_router(db, get_current_user, commission_calculator):
                 detail=f"Insufficient balance. Available: ₹{available:.2f}"
             )
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         payout_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "user_id": current_user["id"],
             "user_name": current_user.get("full_name"),
             "requested_amount": payout.requested_amount,
@@ -523,8 +536,8 @@ def get_financial_router(db, get_current_user, commission_calculator):
             "fees_deducted": 0,
             "final_amount": payout.requested_amount,
             "rejection_reason": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.payout_requests.insert_one(payout_doc)
@@ -561,13 +574,14 @@ def get_financial_router(db, get_current_user, commission_calculator):
         if current_user["role"] not in ["admin", "super_admin"]:
             raise HTTPException(status_code=403, detail="Admin access required")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         result = await db.payout_requests.update_one(
             {"id": payout_id, "request_status": "pending"},
             {"$set": {
                 "request_status": "approved",
                 "approved_by": current_user["id"],
-                "approved_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "approved_at": now_iso,
+                "updated_at": now_iso
             }}
         )
         
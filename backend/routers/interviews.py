@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import uuid
+from utils.ids import new_id
 
 router = APIRouter(prefix="/interviews", tags=["Interviews"])
 
@@ -105,8 +105,9 @@ def get_interview_router(db, get_current_user):
             if user:
                 interviewer_names.append(user.get("full_name", "Unknown"))
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         interview_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "application_id": interview.application_id,
             "candidate_id": application["candidate_id"],
             "job_id": application["job_id"],
@@ -126,8 +127,8 @@ def get_interview_router(db, get_current_user):
             "notes": interview.notes,
             "preparation_notes": interview.preparation_notes,
             "scheduled_by": current_user["id"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         await db.interviews.insert_one(interview_doc)
@@ -137,19 +138,19 @@ def get_interview_router(db, get_current_user):
             {"id": interview.application_id},
             {"$set": {
                 "application_status": "interview_scheduled",
-                "last_status_change": datetime.now(timezone.utc).isoformat()
+                "last_status_change": now_iso
             }}
         )
         
         # Create notification for candidate
         await db.notifications.insert_one({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "user_id": application["candidate_id"],
             "notification_type": "interview_scheduled",
             "title": "Interview Scheduled",
             "message": f"Your interview for {application.get('job_title', 'the position')} has been scheduled.",
             "is_read": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso
         })
         
         return interview_doc
@@ -252,10 +253,11 @@ def get_interview_router(db, get_current_user):
         if not interview:
             raise HTTPException(status_code=404, detail="Interview not found")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         feedback_doc = {
             **feedback.dict(),
             "submitted_by": current_user["id"],
-            "submitted_at": datetime.now(timezone.utc).isoformat()
+            "submitted_at": now_iso
         }
         
         scores = {}
@@ -276,7 +278,7 @@ def get_interview_router(db, get_current_user):
                 "rating": feedback.rating,
                 "scores": scores,
                 "recommendation": feedback.recommendation,
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "updated_at": now_iso
             }}
         )
         
@@ -289,7 +291,7 @@ def get_interview_router(db, get_current_user):
             {"id": interview["application_id"]},
             {"$set": {
                 "application_status": new_status,
-                "last_status_change": datetime.now(timezone.utc).isoformat()
+                "last_status_change": now_iso
             },
             "$push": {
                 "interview_feedback": feedback_doc
@@ -315,24 +317,25 @@ def get_interview_router(db, get_current_user):
         if interview["interview_status"] != "scheduled":
             raise HTTPException(status_code=400, detail="Only scheduled interviews can be cancelled")
         
+        now_iso = datetime.now(timezone.utc).isoformat()
         await db.interviews.update_one(
             {"id": interview_id},
             {"$set": {
                 "interview_status": "cancelled",
                 "notes": reason,
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "updated_at": now_iso
             }}
         )
         
         # Notify candidate
         await db.notifications.insert_one({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "user_id": interview["candidate_id"],
             "notification_type": "interview_cancelled",
             "title": "Interview Cancelled",
             "message": f"Your interview has been cancelled. {reason or ''}",
             "is_read": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_iso
         })
         
         return {"status": "cancelled", "interview_id": interview_id}
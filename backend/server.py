@@ -1,39 +1,58 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Request, Response, Header
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Request, Response, Header, BackgroundTasks
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse, ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, IndexModel, ASCENDING, DESCENDING, ReadPreference, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from pymongo.read_concern import ReadConcern
 import os
 import logging
+import asyncio
+import hashlib
+import secrets
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
-import uuid
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, TypeAdapter
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone, timedelta
+from decimal import Decimal
 import jwt
 import bcrypt
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-import io
-from PyPDF2 import PdfReader
-from docx import Document
 import shutil
-from utils.invoice_generator import InvoiceGenerator
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from utils.invoice_generator import InvoiceGenerator, render_invoice_pdf
 from utils.backup_manager import BackupManager
 from utils.code_export import CodeExporter
+from utils.ids import new_id
+from utils.json_gzip import JSONGZipMiddleware
+from utils.json_export import stream_json_array
+from utils.resume_text import extract_resume_text
 from utils.email_service import EmailService
 from gamification_service import GamificationService
 import httpx
+import aiofiles
+import orjson
 
 # Import new services
-from services.commission_service import CommissionCalculator, create_commission_calculator
+from services.commission_service import (
+    CommissionCalculator, create_commission_calculator, PACKAGE_COMMISSION_RATES, USER_TIER_MULTIPLIERS
+)
 from services.matching_service import CandidateMatcher, create_candidate_matcher
 from services.pipeline_service import ApplicationPipeline, ApplicationStatus, create_application_pipeline
 from services.audit_service import AuditLogger, AuditAction, create_audit_logger
 from services.bgv_service import BGVService, BGVType, BGVStatus, create_bgv_service
+from services.automation_service import create_automation_service
 from services.whatsapp_service import whatsapp_service, NotificationType
 from services.jd_generator_service import jd_generator
-from services.cache_service import cache_manager, cached, CacheKeys, InMemoryCache
+from services.cache_service import cache_manager, cached, CacheKeys, InMemoryCache, LRUTTLCache
+from services.llm_cache_service import create_llm_cache
+from services.llm_rate_limiter import LLMRateLimiter, LLMCapacityError
+from services.fx_rates import fx_rates, to_money
+from services.bulk_writer import create_bulk_writers
 
 # Import routers
 from routers.companies import get_company_router
@@ -46,15 +65,55 @@ ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
+# One client (and pool) is shared by the whole process - never create one per request.
+# minPoolSize keeps warm connections so cold endpoints skip the connect/auth
+# handshake; maxConnecting throttles connection storms on bursts.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', '200')),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', '20')),
+    maxIdleTimeMS=int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000')),
+    maxConnecting=int(os.environ.get('MONGO_MAX_CONNECTING', '4')),
+    waitQueueTimeoutMS=int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000')),
+    serverSelectionTimeoutMS=int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+    retryWrites=True,
+    compressors=os.environ.get('MONGO_COMPRESSORS', 'zstd,zlib')
+)
 db = client[os.environ['DB_NAME']]
 
+# Dashboard/leaderboard reads tolerate secondaries and skip majority waits
+reporting_db = client.get_database(
+    os.environ['DB_NAME'],
+    read_preference=ReadPreference.PRIMARY_PREFERRED,
+    read_concern=ReadConcern("local")
+)
+
 # Initialize enterprise utilities
 invoice_generator = InvoiceGenerator()
 backup_manager = BackupManager()
 code_exporter = CodeExporter()
 email_service = EmailService()
+
+# Archive names per download directory, kept in memory so downloads are an
+# allowlist lookup (which also rules out ../ traversal) rather than path probing
+BACKUP_DIR = Path(backup_manager.backup_dir)
+EXPORT_DIR = Path(code_exporter.export_dir)
+_archive_names = {BACKUP_DIR: set(), EXPORT_DIR: set()}
+
+def refresh_archive_names(directory: Path):
+    with os.scandir(directory) as entries:
+        _archive_names[directory] = {entry.name for entry in entries if entry.is_file()}
+
+def resolve_archive(directory: Path, filename: str, not_found_detail: str) -> Path:
+    """Map a requested archive name to its path, 404 for unknown names"""
+    names = _archive_names[directory]
+    if filename not in names:
+        # Written by another worker since the last refresh?
+        if Path(filename).name != filename or not (directory / filename).is_file():
+            raise HTTPException(status_code=404, detail=not_found_detail)
+        names.add(filename)
+    return directory / filename
 gamification_service = GamificationService(db)
 
 # Initialize new business logic services
@@ -62,25 +121,79 @@ commission_calculator = create_commission_calculator(db)
 candidate_matcher = create_candidate_matcher(db)
 audit_logger = create_audit_logger(db)
 bgv_service = create_bgv_service(db)
+automation_service = create_automation_service(db)
 application_pipeline = create_application_pipeline(db, candidate_matcher)
+llm_cache = create_llm_cache(db)
+# Single-document inserts that can tolerate a few ms of batching share
+# one unordered bulk_write per collection
+bulk_writers = create_bulk_writers(db)
 
 # Emergent Auth configuration
 EMERGENT_AUTH_URL = "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data"
+# Shared so Gmail logins reuse warm keep-alive connections instead of a
+# fresh TCP + TLS handshake each; closed on shutdown
+auth_http_client = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+)
 
 # JWT Configuration
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 720
+# Encoded once instead of on every sign/verify
+JWT_KEY = JWT_SECRET.encode()
+JWT_DECODE_OPTIONS = {"require": ["exp", "user_id"]}
+
+# The only user fields routes read off current_user
+AUTH_USER_PROJECTION = {
+    "_id": 0, "id": 1, "email": 1, "role": 1,
+    "full_name": 1, "currency_preference": 1, "created_at": 1
+}
+# /auth/me-flexible also returns the Gmail OAuth profile fields
+FLEXIBLE_USER_PROJECTION = {**AUTH_USER_PROJECTION, "user_id": 1, "picture": 1, "auth_provider": 1}
+
+# Decoded-JWT and user-document caches for get_current_user
+_token_cache = LRUTTLCache(max_size=10000, ttl_seconds=300)
+_user_cache = LRUTTLCache(max_size=10000, ttl_seconds=30)
+# Gmail OAuth sessions by token digest; short TTL bounds how long a logout
+# on another worker can go unnoticed
+_session_cache = LRUTTLCache(max_size=10000, ttl_seconds=60)
+# Admin-edited platform settings (read on every registration)
+_settings_cache = LRUTTLCache(max_size=32, ttl_seconds=60)
+# Collection name -> Motor collection, for the admin database views
+_collections_cache = LRUTTLCache(max_size=1, ttl_seconds=60)
+# Tracking scopes whose current_day was advanced within the last minute
+_tracking_advanced = LRUTTLCache(max_size=10000, ttl_seconds=60)
+
+# bcrypt work factor (each +1 doubles hashing time)
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+# LLM configuration (resolved once, not per call)
+EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY', '')
+RESUME_PARSER_SYSTEM_MESSAGE = "You are an expert resume parser. Extract structured information from resumes."
+RESUME_SCORER_SYSTEM_MESSAGE = "You are an expert recruiter analyzing candidate fit."
+
+# Process-wide limits on GPT-4o calls (bulk scoring fans out per resume)
+llm_limiter = LLMRateLimiter(
+    max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", "8")),
+    requests_per_minute=int(os.environ.get("LLM_REQUESTS_PER_MINUTE", "500")),
+    acquire_timeout=float(os.environ.get("LLM_ACQUIRE_TIMEOUT_SECONDS", "30"))
+)
 
 # File upload configuration
 UPLOAD_DIR = "/app/uploads"
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Documents per getMore when streaming list endpoints off a cursor
+LIST_BATCH_SIZE = 200
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs("/app/bgv_reports", exist_ok=True)
 
 # Security
 security = HTTPBearer()
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # ATS Stage definitions
@@ -94,6 +207,89 @@ ATS_STAGES = [
     {"id": "rejected", "name": "Rejected", "order": 7, "color": "#ef4444"},
 ]
 
+# Static, so serialize once at import
+ATS_STAGES_JSON = orjson.dumps(ATS_STAGES)
+ATS_STAGE_IDS = frozenset(stage["id"] for stage in ATS_STAGES)
+
+# Collections included in full backups
+BACKUP_COLLECTIONS = (
+    "users", "jobs", "applications", "resumes", "referrals",
+    "notifications", "documents", "ats_pipelines", "bgv_requests",
+    "candidate_tracking", "invoices", "automation_rules"
+)
+
+# Indexes backing the hot query predicates, created on startup
+# Named so get_leaderboard can hint it
+LEADERBOARD_INDEX = "lb_idx"
+
+API_INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        # Covers the per-request auth lookup (AUTH_USER_PROJECTION)
+        IndexModel([
+            ("id", ASCENDING), ("role", ASCENDING), ("email", ASCENDING),
+            ("full_name", ASCENDING), ("currency_preference", ASCENDING), ("created_at", ASCENDING)
+        ]),
+        # Gmail OAuth sessions resolve their user by user_id
+        IndexModel([("user_id", ASCENDING)], sparse=True),
+    ],
+    "user_sessions": [
+        IndexModel([("session_token", ASCENDING)], unique=True),
+        # Expired sessions are removed by Mongo's TTL monitor
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("company_id", ASCENDING), ("status", ASCENDING)]),
+    ],
+    "applications": [
+        IndexModel([("job_id", ASCENDING), ("candidate_id", ASCENDING)], unique=True),
+        IndexModel([("candidate_id", ASCENDING), ("match_score", DESCENDING)]),
+        IndexModel([("company_id", ASCENDING), ("match_score", DESCENDING)]),
+        IndexModel([("job_id", ASCENDING), ("match_score", DESCENDING)]),
+        IndexModel([("id", ASCENDING)]),
+    ],
+    "resumes": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("candidate_id", ASCENDING)]),
+    ],
+    "referrals": [
+        # Covers the leaderboard $group
+        IndexModel([("referrer_id", ASCENDING), ("status", ASCENDING), ("reward_amount", ASCENDING)], name=LEADERBOARD_INDEX),
+    ],
+    "ats_pipelines": [
+        IndexModel([("application_id", ASCENDING)], unique=True),
+    ],
+    "documents": [
+        IndexModel([("category", ASCENDING), ("related_to", ASCENDING)]),
+        IndexModel([("related_to", ASCENDING)]),
+    ],
+    "bgv_requests": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("requested_by", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("candidate_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("checks.assigned_to", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "candidate_tracking": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("company_id", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("candidate_id", ASCENDING), ("status", ASCENDING)]),
+    ],
+    "invoices": [
+        IndexModel([("id", ASCENDING)]),
+        IndexModel([("company_id", ASCENDING), ("status", ASCENDING)]),
+    ],
+    "notifications": [
+        # Unread badge count is an index-only scan
+        IndexModel([("user_id", ASCENDING), ("read", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "job_views": [
+        IndexModel([("job_id", ASCENDING), ("viewed_at", ASCENDING)]),
+    ],
+}
+
 # ============= Models =============
 
 class UserBase(BaseModel):
@@ -200,13 +396,256 @@ class DashboardStats(BaseModel):
     total_recruiters: int = 0
     total_companies: int = 0
 
+def response_projection(model: type) -> Dict[str, int]:
+    """Mongo projection fetching exactly a response model's fields"""
+    return {"_id": 0, **{field: 1 for field in model.model_fields}}
+
+# List views move only the fields they return
+RESUME_LIST_PROJECTION = response_projection(ResumeAnalysis)
+APPLICATION_LIST_PROJECTION = response_projection(ApplicationResponse)
+REFERRAL_LIST_PROJECTION = response_projection(ReferralResponse)
+USER_LIST_PROJECTION = response_projection(UserResponse)
+
+# Hot list endpoints serialize straight to JSON bytes in pydantic-core
+JOB_LIST_ADAPTER = TypeAdapter(List[JobResponse])
+RESUME_LIST_ADAPTER = TypeAdapter(List[ResumeAnalysis])
+APPLICATION_LIST_ADAPTER = TypeAdapter(List[ApplicationResponse])
+REFERRAL_LIST_ADAPTER = TypeAdapter(List[ReferralResponse])
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+
 # ============= Helper Functions =============
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+def compute_overall_score(skills_count: int, experience_years: int, education_count: int) -> int:
+    """Resume overall score - keep in sync with RESUME_OVERALL_SCORE_EXPR"""
+    return min(100, (skills_count * 5) + (experience_years * 3) + (education_count * 10))
+
+# Server-side equivalent of compute_overall_score for pipeline updates
+RESUME_OVERALL_SCORE_EXPR = {"$min": [100, {"$add": [
+    {"$multiply": [{"$size": {"$ifNull": ["$skills", []]}}, 5]},
+    {"$multiply": [{"$ifNull": ["$experience_years", 0]}, 3]},
+    {"$multiply": [{"$size": {"$ifNull": ["$education", []]}}, 10]}
+]}]}
+
+def build_llm_chat(session_id: str, system_message: str) -> LlmChat:
+    """Build a GPT-4o chat from the module-level LLM configuration"""
+    # LlmChat keeps per-instance message history, so a fresh one per
+    # conversation is required - only the configuration is shared. The HTTP
+    # transport is owned by emergentintegrations (no client injection point),
+    # so connection reuse is left to the library rather than patched in here.
+    return LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=session_id,
+        system_message=system_message
+    ).with_model("openai", "gpt-4o")
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+async def iter_file_range(path: str, start: int, end: int):
+    """Yield bytes [start, end] of a file in bounded chunks"""
+    remaining = end - start + 1
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        while remaining > 0:
+            chunk = await f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+# When set (e.g. "/internal"), full downloads are handed to the reverse proxy via
+# X-Accel-Redirect so nginx sendfile()s them instead of streaming through Python.
+# The proxy needs a matching internal location, e.g. `location /internal/ { internal; alias /; }`
+DOWNLOAD_ACCEL_PREFIX = os.environ.get("DOWNLOAD_ACCEL_PREFIX", "").rstrip("/")
+
+def file_download_response(
+    request: Request,
+    path: str,
+    filename: str,
+    media_type: str,
+    not_found_detail: str = "File not found"
+):
+    """Serve a file download, honouring a single-range Range header"""
+    # One stat serves the existence check, Content-Length and the range bounds
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    
+    range_header = request.headers.get("range")
+    if not range_header or not range_header.startswith("bytes="):
+        if DOWNLOAD_ACCEL_PREFIX:
+            return Response(
+                media_type=media_type,
+                headers={
+                    "X-Accel-Redirect": f"{DOWNLOAD_ACCEL_PREFIX}{os.path.abspath(path)}",
+                    "Content-Disposition": f'attachment; filename="{filename}"'
+                }
+            )
+        return FileResponse(
+            path,
+            filename=filename,
+            media_type=media_type,
+            stat_result=stat_result,
+            headers={"Accept-Ranges": "bytes"}
+        )
+    
+    file_size = stat_result.st_size
+    try:
+        start_str, end_str = range_header[len("bytes="):].split(",")[0].strip().split("-")
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else file_size - 1
+        else:
+            # Suffix range: last N bytes
+            start = max(0, file_size - int(end_str))
+            end = file_size - 1
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Invalid range")
+    
+    end = min(end, file_size - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    
+    return StreamingResponse(
+        iter_file_range(path, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers={
+            "Content-Range": f"bytes {start}-{end}/{file_size}",
+            "Content-Length": str(end - start + 1),
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
+def model_list_response(adapter: TypeAdapter, items: list) -> Response:
+    """
+    Dump already-trusted models in one pass, skipping FastAPI's response_model
+    re-validation and the intermediate dicts handed to ORJSONResponse
+    """
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+def model_response(model: BaseModel) -> Response:
+    """Single-model counterpart of model_list_response"""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+# Polled list endpoints revalidate with ETags instead of re-sending the body
+LIST_CACHE_CONTROL = "private, max-age=5"
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL, "Vary": "Authorization"}
+    )
+
+def serialize_with_etag(payload: Any) -> Tuple[bytes, str]:
+    body = orjson.dumps(payload)
+    return body, f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+def etag_body_response(request: Request, body: bytes, etag: str) -> Response:
+    """Answer 304 when the client copy is current, else send the pre-serialized body"""
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL, "Vary": "Authorization"}
+    )
+
+def etag_json_response(request: Request, payload: Any) -> Response:
+    """Serialize once, hash the body and answer 304 when the client copy is current"""
+    return etag_body_response(request, *serialize_with_etag(payload))
+
+async def cached_list_response(request: Request, prefix: str, current_user: dict, **params) -> Optional[Response]:
+    """Serve a polled list from the short-lived per-user cache, if present"""
+    hit = await cache_manager.get_list(prefix, current_user["id"], current_user["role"], **params)
+    if hit is None:
+        return None
+    return etag_body_response(request, *hit)
+
+async def cache_list_response(request: Request, prefix: str, current_user: dict, payload: Any, **params) -> Response:
+    """Serialize a list once, cache the body + ETag for the user and respond"""
+    body_and_etag = serialize_with_etag(payload)
+    await cache_manager.set_list(prefix, current_user["id"], current_user["role"], body_and_etag, **params)
+    return etag_body_response(request, *body_and_etag)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def wants_ndjson(request: Request) -> bool:
+    """Clients opt into line-delimited streaming via the Accept header"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+async def iter_ndjson(cursor):
+    """Yield one orjson-encoded document per line straight off the cursor"""
+    async for doc in cursor:
+        yield orjson.dumps(doc) + b"\n"
+
+def ndjson_response(cursor) -> StreamingResponse:
+    """Stream a cursor without materializing the list or a second JSON copy"""
+    return StreamingResponse(iter_ndjson(cursor), media_type=NDJSON_MEDIA_TYPE)
+
+def directory_etag(path: str) -> str:
+    """Weak ETag from a directory's mtime; changes whenever an entry is added or removed"""
+    return f'W/"{os.stat(path).st_mtime_ns:x}"'
+
+# Worker processes are spawned fresh; forking this process would copy the
+# Motor/httpx threads' locks mid-use and can deadlock the children
+_worker_context = multiprocessing.get_context("spawn")
+
+# CPU-bound resume text extraction runs in worker processes (no GIL contention);
+# slots bound the backlog so a burst is rejected instead of queueing unbounded
+RESUME_EXTRACT_WORKERS = int(os.environ.get("RESUME_EXTRACT_WORKERS", str(min(os.cpu_count() or 1, 4))))
+_extract_pool = ProcessPoolExecutor(max_workers=RESUME_EXTRACT_WORKERS, mp_context=_worker_context)
+_extract_slots = asyncio.Semaphore(RESUME_EXTRACT_WORKERS * 4)
+RESUME_EXTRACT_QUEUE_TIMEOUT = 10
+
+async def extract_text_for_resume(path: str, file_name: str) -> str:
+    """Extract capped resume text from a spooled upload without blocking the event loop"""
+    try:
+        await asyncio.wait_for(_extract_slots.acquire(), timeout=RESUME_EXTRACT_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Resume processing is busy, please retry shortly")
+    
+    # The slot is held until the worker is really done, even if this request
+    # is cancelled meanwhile, so the backlog bound keeps holding
+    future = asyncio.get_running_loop().run_in_executor(_extract_pool, extract_resume_text, path, file_name)
+    future.add_done_callback(lambda _: _extract_slots.release())
+    return await asyncio.shield(future)
+
+# ReportLab rendering is CPU-bound and synchronous; keep it off the event loop
+_pdf_pool = ProcessPoolExecutor(
+    max_workers=int(os.environ.get("INVOICE_PDF_WORKERS", "2")),
+    mp_context=_worker_context
+)
+# A stuck render gives up after this long; the invoice is stored without a PDF
+INVOICE_PDF_TIMEOUT = float(os.environ.get("INVOICE_PDF_TIMEOUT", "30"))
+
+# bcrypt releases the GIL, so hashes run in parallel on their own threads
+# instead of queueing behind file I/O in the default executor
+_hash_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(os.cpu_count() or 1, 4)))),
+    thread_name_prefix="bcrypt"
+)
+
+async def hash_password(password: str) -> str:
+    # bcrypt is deliberately slow - keep it off the event loop
+    loop = asyncio.get_running_loop()
+    hashed = await loop.run_in_executor(_hash_pool, bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS))
+    return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
 
 def create_token(user_id: str, email: str, role: str) -> str:
     expiration = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
@@ -216,30 +655,75 @@ def create_token(user_id: str, email: str, role: str) -> str:
         "role": role,
         "exp": expiration
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return jwt.encode(payload, JWT_KEY, algorithm=JWT_ALGORITHM)
+
+def token_cache_key(token: str) -> bytes:
+    """Fixed-size digest so the auth cache never holds raw bearer tokens"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 def decode_token(token: str) -> dict:
+    cache_key = token_cache_key(token)
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+    
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_KEY, algorithms=[JWT_ALGORITHM], options=JWT_DECODE_OPTIONS)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    # Never cache past the token's own expiry
+    _token_cache.set(cache_key, payload, ttl=payload["exp"] - datetime.now(timezone.utc).timestamp())
+    return payload
+
+def invalidate_cached_user(user_id: str):
+    """Drop a user document from the auth cache after it changes"""
+    _user_cache.delete(user_id)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
     payload = decode_token(token)
-    user = await db.users.find_one({"id": payload["user_id"]}, {"_id": 0, "password": 0})
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
-
+    user = _user_cache.get(payload["user_id"])
+    if user is None:
+        user = await db.users.find_one({"id": payload["user_id"]}, AUTH_USER_PROJECTION)
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        _user_cache.set(payload["user_id"], user)
+    # Callers may mutate the dict; hand out a copy
+    return dict(user)
+
+
+def require_role(*roles: str, detail: str = "Access denied"):
+    """Dependency returning the current user if their role is one of roles, else 403"""
+    allowed = frozenset(roles)
+    
+    async def dependency(current_user: dict = Depends(get_current_user)) -> dict:
+        if current_user["role"] not in allowed:
+            raise HTTPException(status_code=403, detail=detail)
+        return current_user
+    
+    return dependency
+
+# Built once and shared by every endpoint with the same rule
+REQUIRE_ADMIN = require_role("admin", detail="Admin access required")
+REQUIRE_ANY_ADMIN = require_role("admin", "super_admin", detail="Admin access required")
+REQUIRE_HIRING_TEAM = require_role("admin", "company", "recruiter")
+REQUIRE_RECRUITER_OR_ADMIN = require_role("admin", "super_admin", "recruiter")
+REQUIRE_JD_AUTHOR = require_role("admin", "super_admin", "recruiter", "client")
+REQUIRE_BGV_SPECIALIST = require_role("admin", "bgv_specialist")
+
+async def get_domain_restrictions() -> dict:
+    """Domain restriction settings, cached briefly ({} when never configured)"""
+    settings = _settings_cache.get("domain_restrictions")
+    if settings is None:
+        settings = await db.platform_settings.find_one({"key": "domain_restrictions"}, {"_id": 0}) or {}
+        _settings_cache.set("domain_restrictions", settings)
+    return settings
 
-async def check_domain_allowed(email: str) -> bool:
-    """Check if email domain is allowed based on admin settings"""
-    # Get domain restrictions from database
-    settings = await db.platform_settings.find_one({"key": "domain_restrictions"}, {"_id": 0})
-    
+def is_domain_allowed(email: str, settings: dict) -> bool:
+    """Check an email's domain against the domain restriction settings"""
     if not settings or not settings.get("enabled", False):
         # No restrictions - allow all domains
         return True
@@ -251,6 +735,30 @@ async def check_domain_allowed(email: str) -> bool:
     email_domain = email.split('@')[1].lower()
     return email_domain in [d.lower() for d in allowed_domains]
 
+async def get_session(session_token: str) -> Optional[dict]:
+    """Look up a Gmail OAuth session (user_id + aware expires_at), cached briefly"""
+    cache_key = token_cache_key(session_token)
+    session = _session_cache.get(cache_key)
+    if session is not None:
+        return session
+    
+    session = await db.user_sessions.find_one(
+        {"session_token": session_token}, {"_id": 0, "user_id": 1, "expires_at": 1}
+    )
+    if not session:
+        return None
+    
+    expires_at = session["expires_at"]
+    if isinstance(expires_at, str):
+        expires_at = datetime.fromisoformat(expires_at)
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    session["expires_at"] = expires_at
+    
+    # Never cache past the session's own expiry
+    _session_cache.set(cache_key, session, ttl=(expires_at - datetime.now(timezone.utc)).total_seconds())
+    return session
+
 async def get_current_user_flexible(request: Request):
     """Get current user from either cookie or Authorization header"""
     # REMINDER: DO NOT HARDCODE THE URL, OR ADD ANY FALLBACKS OR REDIRECT URLS, THIS BREAKS THE AUTH
@@ -260,18 +768,12 @@ async def get_current_user_flexible(request: Request):
     
     if session_token:
         # Validate session token
-        session = await db.user_sessions.find_one({"session_token": session_token}, {"_id": 0})
+        session = await get_session(session_token)
         if session:
-            expires_at = session["expires_at"]
-            if isinstance(expires_at, str):
-                expires_at = datetime.fromisoformat(expires_at)
-            if expires_at.tzinfo is None:
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-            
-            if expires_at < datetime.now(timezone.utc):
+            if session["expires_at"] < datetime.now(timezone.utc):
                 raise HTTPException(status_code=401, detail="Session expired")
             
-            user = await db.users.find_one({"user_id": session["user_id"]}, {"_id": 0, "password": 0})
+            user = await db.users.find_one({"user_id": session["user_id"]}, FLEXIBLE_USER_PROJECTION)
             if user:
                 return user
     
@@ -281,7 +783,7 @@ async def get_current_user_flexible(request: Request):
         token = auth_header.split(" ")[1]
         try:
             payload = decode_token(token)
-            user = await db.users.find_one({"id": payload["user_id"]}, {"_id": 0, "password": 0})
+            user = await db.users.find_one({"id": payload["user_id"]}, FLEXIBLE_USER_PROJECTION)
             if user:
                 return user
         except:
@@ -289,31 +791,54 @@ async def get_current_user_flexible(request: Request):
     
     raise HTTPException(status_code=401, detail="Not authenticated")
 
-async def parse_resume_with_ai(file_content: bytes, file_name: str) -> Dict[str, Any]:
-    """Parse resume using GPT-4o via emergentintegrations"""
+def save_upload(source, path: str) -> int:
+    """Copy an upload's spooled file to path; returns the bytes written"""
     try:
-        # Extract text from PDF or DOCX
-        text_content = ""
+        with open(path, "wb") as destination:
+            shutil.copyfileobj(source, destination, UPLOAD_CHUNK_SIZE)
+            return destination.tell()
+    except BaseException:
+        # Never leave a truncated file behind without a document record
+        if os.path.exists(path):
+            os.unlink(path)
+        raise
+
+def _spool_upload(source, destination, digest) -> None:
+    """Copy an upload to disk chunk by chunk, hashing as it goes"""
+    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+        digest.update(chunk)
+        destination.write(chunk)
+
+async def spool_resume_upload(file: UploadFile) -> Tuple[str, str]:
+    """
+    Stream an uploaded resume to a temp file (never fully in memory).
+    Returns the file path and its content-addressed parse cache key, which
+    folds in the parser prompt so edits to it miss.
+    """
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    digest = hashlib.sha256(RESUME_PARSER_SYSTEM_MESSAGE.encode())
+    digest.update(extension.encode())
+    with tempfile.NamedTemporaryFile(prefix="resume-", suffix=extension, delete=False) as spooled:
+        try:
+            await asyncio.to_thread(_spool_upload, file.file, spooled, digest)
+        except BaseException:
+            os.unlink(spooled.name)
+            raise
+    return spooled.name, f"file:{digest.hexdigest()}"
+
+async def parse_resume_with_ai(path: str, file_name: str, file_key: str) -> Dict[str, Any]:
+    """Parse a spooled resume file using GPT-4o via emergentintegrations"""
+    try:
+        # Byte-identical re-uploads skip extraction and the LLM call
+        cached_data = await llm_cache.get(file_key)
+        if cached_data is not None:
+            return cached_data
         
-        if file_name.endswith('.pdf'):
-            pdf_reader = PdfReader(io.BytesIO(file_content))
-            for page in pdf_reader.pages:
-                text_content += page.extract_text()
-        elif file_name.endswith('.docx'):
-            doc = Document(io.BytesIO(file_content))
-            for para in doc.paragraphs:
-                text_content += para.text + "\n"
-        else:
-            text_content = file_content.decode('utf-8', errors='ignore')
+        # Extract text from PDF or DOCX
+        text_content = await extract_text_for_resume(path, file_name)
         
         # Use AI to parse resume
-        api_key = os.environ.get('EMERGENT_LLM_KEY', '')
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=str(uuid.uuid4()),
-            system_message="You are an expert resume parser. Extract structured information from resumes."
-        ).with_model("openai", "gpt-4o")
-        
+        system_message = RESUME_PARSER_SYSTEM_MESSAGE
         prompt = f"""Parse this resume and extract the following information in JSON format:
 {{
   "name": "Full name",
@@ -327,19 +852,38 @@ async def parse_resume_with_ai(file_content: bytes, file_name: str) -> Dict[str,
 }}
 
 Resume:
-{text_content[:4000]}
+{text_content}
 
 Respond ONLY with valid JSON, no additional text."""
         
-        response = await chat.send_message(UserMessage(text=prompt))
+        # Serve repeated uploads of the same resume from cache
+        cache_key = llm_cache.prompt_key(system_message, prompt)
+        cached_data = await llm_cache.get(cache_key)
+        if cached_data is not None:
+            await llm_cache.set(file_key, cached_data)
+            return cached_data
+        
+        # Stable session id per prompt so the provider-side prefix cache can hit
+        chat = build_llm_chat(f"parse:{cache_key}", system_message)
+        
+        response = await llm_limiter.run(lambda: chat.send_message(UserMessage(text=prompt)))
         
         # Parse JSON response
-        import json
-        parsed_data = json.loads(response)
+        parsed_data = orjson.loads(response)
+        
+        await asyncio.gather(
+            llm_cache.set(cache_key, parsed_data),
+            llm_cache.set(file_key, parsed_data)
+        )
         
         return parsed_data
+    except LLMCapacityError:
+        # Tell the client to retry rather than returning fallback data
+        raise HTTPException(status_code=503, detail="AI service busy, please retry shortly")
+    except HTTPException:
+        raise
     except Exception as e:
-        logging.error(f"Resume parsing error: {str(e)}")
+        logging.error("Resume parsing error: %s", e)
         return {
             "name": "Unknown",
             "email": "",
@@ -354,13 +898,7 @@ Respond ONLY with valid JSON, no additional text."""
 async def score_resume_with_ai(resume_data: Dict, job_description: str) -> Dict[str, Any]:
     """Score resume against job description using AI"""
     try:
-        api_key = os.environ.get('EMERGENT_LLM_KEY', '')
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=str(uuid.uuid4()),
-            system_message="You are an expert recruiter analyzing candidate fit."
-        ).with_model("openai", "gpt-4o")
-        
+        system_message = RESUME_SCORER_SYSTEM_MESSAGE
         prompt = f"""Analyze this candidate's resume against the job description and provide a matching score.
 
 Job Description:
@@ -382,14 +920,27 @@ Provide a JSON response with:
 
 Respond ONLY with valid JSON."""
         
-        response = await chat.send_message(UserMessage(text=prompt))
+        # Same (resume, job) pair scores the same - reuse the cached result
+        cache_key = llm_cache.prompt_key(system_message, prompt)
+        cached_score = await llm_cache.get(cache_key)
+        if cached_score is not None:
+            return cached_score
+        
+        # Stable session id per prompt so the provider-side prefix cache can hit
+        chat = build_llm_chat(f"score:{cache_key}", system_message)
+        
+        response = await llm_limiter.run(lambda: chat.send_message(UserMessage(text=prompt)))
+        
+        score_data = orjson.loads(response)
         
-        import json
-        score_data = json.loads(response)
+        await llm_cache.set(cache_key, score_data)
         
         return score_data
+    except LLMCapacityError:
+        # Tell the client to retry rather than returning fallback data
+        raise HTTPException(status_code=503, detail="AI service busy, please retry shortly")
     except Exception as e:
-        logging.error(f"Resume scoring error: {str(e)}")
+        logging.error("Resume scoring error: %s", e)
         return {
             "match_score": 50,
             "strengths": [],
@@ -397,30 +948,73 @@ Respond ONLY with valid JSON."""
             "recommendation": "Manual review recommended"
         }
 
+async def ensure_indexes():
+    """Create API_INDEXES, one create_indexes batch per collection"""
+    for collection_name, indexes in API_INDEXES.items():
+        try:
+            await db[collection_name].create_indexes(indexes)
+        except Exception as e:
+            logging.warning("Index creation on %s failed: %s", collection_name, e)
+
+async def backfill_job_application_counts():
+    """Populate applications_count on jobs created before it was maintained"""
+    pipeline = [
+        {"$match": {"applications_count": {"$exists": False}}},
+        {"$lookup": {
+            "from": "applications",
+            "localField": "id",
+            "foreignField": "job_id",
+            "pipeline": [{"$project": {"_id": 1}}],
+            "as": "apps"
+        }},
+        {"$project": {"applications_count": {"$size": "$apps"}}},
+        {"$merge": {"into": "jobs", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ]
+    await db.jobs.aggregate(pipeline).to_list(None)
+
+async def backfill_application_company_ids():
+    """Copy company_id from the job onto applications created before it was stored"""
+    pipeline = [
+        {"$match": {"company_id": {"$exists": False}}},
+        {"$lookup": {
+            "from": "jobs",
+            "localField": "job_id",
+            "foreignField": "id",
+            "pipeline": [{"$project": {"_id": 0, "company_id": 1}}],
+            "as": "job"
+        }},
+        {"$unwind": "$job"},
+        {"$project": {"company_id": "$job.company_id"}},
+        {"$merge": {"into": "applications", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ]
+    await db.applications.aggregate(pipeline).to_list(None)
+
 # ============= Routes =============
 
 @api_router.post("/auth/register", response_model=TokenResponse)
 async def register(user: UserCreate):
-    # Check domain restrictions
-    if not await check_domain_allowed(user.email):
+    # Domain restrictions and the existing-user probe are independent
+    settings, existing = await asyncio.gather(
+        get_domain_restrictions(),
+        db.users.find_one({"email": user.email}, {"_id": 0, "id": 1})
+    )
+    if not is_domain_allowed(user.email, settings):
         raise HTTPException(
             status_code=403, 
             detail="Registration not allowed for this email domain. Please contact administrator."
         )
     
-    # Check if user exists
-    existing = await db.users.find_one({"email": user.email}, {"_id": 0, "id": 1})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
-    user_id = str(uuid.uuid4())
+    user_id = new_id()
     user_doc = {
         "id": user_id,
         "email": user.email,
         "full_name": user.full_name,
         "role": user.role,
-        "password": hash_password(user.password),
+        "password": await hash_password(user.password),
         "currency_preference": "INR",  # Default currency
         "created_at": datetime.now(timezone.utc).isoformat()
     }
@@ -443,7 +1037,7 @@ async def register(user: UserCreate):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user["password"]):
+    if not user or not await verify_password(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     token = create_token(user["id"], user["email"], user["role"])
@@ -461,26 +1055,27 @@ async def login(credentials: UserLogin):
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_me(current_user: dict = Depends(get_current_user)):
-    return UserResponse(**current_user)
+    return model_response(UserResponse.model_construct(**current_user))
 
 @api_router.post("/jobs", response_model=JobResponse)
-async def create_job(job: JobCreate, current_user: dict = Depends(get_current_user)):
-    if current_user["role"] not in ["company", "admin"]:
-        raise HTTPException(status_code=403, detail="Only companies can post jobs")
-    
-    job_id = str(uuid.uuid4())
+async def create_job(
+    job: JobCreate,
+    current_user: dict = Depends(require_role("company", "admin", detail="Only companies can post jobs"))
+):
+    job_id = new_id()
     job_doc = {
         "id": job_id,
         "company_id": current_user["id"],
         "company_name": current_user["full_name"],
         "status": "active",
+        "applications_count": 0,
         "created_at": datetime.now(timezone.utc).isoformat(),
         **job.model_dump()
     }
     
     await db.jobs.insert_one(job_doc)
     
-    return JobResponse(**{k: v for k, v in job_doc.items() if k != "_id"}, applications_count=0)
+    return model_response(JobResponse.model_construct(**{k: v for k, v in job_doc.items() if k != "_id"}))
 
 @api_router.get("/jobs", response_model=List[JobResponse])
 async def get_jobs(status: Optional[str] = None, limit: int = 100, current_user: dict = Depends(get_current_user)):
@@ -490,28 +1085,11 @@ async def get_jobs(status: Optional[str] = None, limit: int = 100, current_user:
     if current_user["role"] == "company":
         query["company_id"] = current_user["id"]
     
-    # Use aggregation to get application counts in one query
-    pipeline = [
-        {"$match": query},
-        {"$limit": limit},
-        {"$lookup": {
-            "from": "applications",
-            "localField": "id",
-            "foreignField": "job_id",
-            "as": "applications"
-        }},
-        {"$addFields": {
-            "applications_count": {"$size": "$applications"}
-        }},
-        {"$project": {
-            "_id": 0,
-            "applications": 0
-        }}
-    ]
-    
-    jobs = await db.jobs.aggregate(pipeline).to_list(limit)
+    # applications_count is maintained by create_application
+    jobs = await db.jobs.find(query, {"_id": 0}).limit(limit).to_list(limit)
     
-    return [JobResponse(**job) for job in jobs]
+    # Documents come straight from our own collection - skip re-validation
+    return model_list_response(JOB_LIST_ADAPTER, [JobResponse.model_construct(**job) for job in jobs])
 
 @api_router.get("/jobs/{job_id}", response_model=JobResponse)
 async def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
@@ -519,30 +1097,32 @@ async def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    count = await db.applications.count_documents({"job_id": job_id})
-    job["applications_count"] = count
+    # applications_count is maintained by create_application
+    job.setdefault("applications_count", 0)
     
-    return JobResponse(**job)
+    return model_response(JobResponse.model_construct(**job))
 
 @api_router.post("/resumes/upload")
-async def upload_resume(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
-    if current_user["role"] not in ["candidate", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Only candidates and recruiters can upload resumes")
-    
-    # Read file content
-    content = await file.read()
-    
-    # Parse resume with AI
-    parsed_data = await parse_resume_with_ai(content, file.filename)
+async def upload_resume(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(require_role("candidate", "recruiter", detail="Only candidates and recruiters can upload resumes"))
+):
+    # Stream the upload to disk; extraction reads it from there
+    path, file_key = await spool_resume_upload(file)
+    try:
+        parsed_data = await parse_resume_with_ai(path, file.filename, file_key)
+    finally:
+        os.unlink(path)
     
     # Calculate overall score based on parsed data
-    skills_count = len(parsed_data.get('skills', []))
     experience_years = parsed_data.get('experience_years', 0)
-    education_count = len(parsed_data.get('education', []))
-    
-    overall_score = min(100, (skills_count * 5) + (experience_years * 3) + (education_count * 10))
+    overall_score = compute_overall_score(
+        len(parsed_data.get('skills', [])),
+        experience_years,
+        len(parsed_data.get('education', []))
+    )
     
-    resume_id = str(uuid.uuid4())
+    resume_id = new_id()
     resume_doc = {
         "id": resume_id,
         "candidate_id": current_user["id"],
@@ -557,7 +1137,17 @@ async def upload_resume(file: UploadFile = File(...), current_user: dict = Depen
     
     await db.resumes.insert_one(resume_doc)
     
-    return ResumeAnalysis(**{k: v for k, v in resume_doc.items() if k != "_id"})
+    return model_response(ResumeAnalysis.model_construct(**{k: v for k, v in resume_doc.items() if k != "_id"}))
+
+@api_router.post("/admin/resumes/rescore")
+async def rescore_resumes(current_user: dict = Depends(REQUIRE_ADMIN)):
+    """Recompute overall_score for every resume in a single server-side update"""
+    result = await db.resumes.update_many(
+        {},
+        [{"$set": {"overall_score": RESUME_OVERALL_SCORE_EXPR}}]
+    )
+    
+    return {"message": "Resumes rescored", "matched": result.matched_count, "modified": result.modified_count}
 
 @api_router.get("/resumes", response_model=List[ResumeAnalysis])
 async def get_resumes(limit: int = 100, current_user: dict = Depends(get_current_user)):
@@ -565,26 +1155,24 @@ async def get_resumes(limit: int = 100, current_user: dict = Depends(get_current
     if current_user["role"] == "candidate":
         query["candidate_id"] = current_user["id"]
     
-    resumes = await db.resumes.find(query, {"_id": 0}).limit(limit).to_list(limit)
-    return [ResumeAnalysis(**r) for r in resumes]
+    cursor = db.resumes.find(query, RESUME_LIST_PROJECTION).limit(limit).batch_size(LIST_BATCH_SIZE)
+    return model_list_response(RESUME_LIST_ADAPTER, [ResumeAnalysis.model_construct(**r) async for r in cursor])
 
 @api_router.post("/applications", response_model=ApplicationResponse)
-async def create_application(app: ApplicationCreate, current_user: dict = Depends(get_current_user)):
-    if current_user["role"] != "candidate":
-        raise HTTPException(status_code=403, detail="Only candidates can apply")
-    
-    # Check if already applied
-    existing = await db.applications.find_one({
-        "job_id": app.job_id,
-        "candidate_id": current_user["id"]
-    })
+async def create_application(
+    app: ApplicationCreate,
+    current_user: dict = Depends(require_role("candidate", detail="Only candidates can apply"))
+):
+    # The duplicate probe only spares the scoring call; the unique
+    # (job_id, candidate_id) index is what rejects concurrent applies
+    existing, job, resume = await asyncio.gather(
+        db.applications.find_one({"job_id": app.job_id, "candidate_id": current_user["id"]}, {"_id": 1}),
+        db.jobs.find_one({"id": app.job_id}, {"_id": 0}),
+        db.resumes.find_one({"id": app.resume_id}, {"_id": 0})
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Already applied to this job")
     
-    # Get job and resume
-    job = await db.jobs.find_one({"id": app.job_id}, {"_id": 0})
-    resume = await db.resumes.find_one({"id": app.resume_id}, {"_id": 0})
-    
     if not job or not resume:
         raise HTTPException(status_code=404, detail="Job or resume not found")
     
@@ -592,11 +1180,12 @@ async def create_application(app: ApplicationCreate, current_user: dict = Depend
     job_desc = f"{job['title']} - {job['description']} Requirements: {' '.join(job['requirements'])}"
     score_result = await score_resume_with_ai(resume['parsed_data'], job_desc)
     
-    app_id = str(uuid.uuid4())
+    app_id = new_id()
     app_doc = {
         "id": app_id,
         "job_id": app.job_id,
         "job_title": job["title"],
+        "company_id": job["company_id"],
         "candidate_id": current_user["id"],
         "candidate_name": current_user["full_name"],
         "resume_id": app.resume_id,
@@ -606,9 +1195,13 @@ async def create_application(app: ApplicationCreate, current_user: dict = Depend
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.applications.insert_one(app_doc)
+    try:
+        await db.applications.insert_one(app_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already applied to this job")
+    await db.jobs.update_one({"id": app.job_id}, {"$inc": {"applications_count": 1}})
     
-    return ApplicationResponse(**{k: v for k, v in app_doc.items() if k not in ["_id", "score_details"]})
+    return model_response(ApplicationResponse.model_construct(**{k: v for k, v in app_doc.items() if k not in ["_id", "score_details"]}))
 
 @api_router.get("/applications", response_model=List[ApplicationResponse])
 async def get_applications(job_id: Optional[str] = None, limit: int = 100, current_user: dict = Depends(get_current_user)):
@@ -617,69 +1210,155 @@ async def get_applications(job_id: Optional[str] = None, limit: int = 100, curre
     if current_user["role"] == "candidate":
         query["candidate_id"] = current_user["id"]
     elif current_user["role"] == "company":
-        # Use aggregation to efficiently get applications for company's jobs
-        pipeline = [
-            {"$match": {"company_id": current_user["id"]}},
-            {"$project": {"id": 1, "_id": 0}},
-            {"$limit": limit}
-        ]
-        jobs = await db.jobs.aggregate(pipeline).to_list(limit)
-        job_ids = [j["id"] for j in jobs]
-        query["job_id"] = {"$in": job_ids}
+        # company_id is denormalized onto applications at insert time
+        query["company_id"] = current_user["id"]
     
     if job_id:
         query["job_id"] = job_id
     
-    applications = await db.applications.find(query, {"_id": 0}).sort("match_score", -1).limit(limit).to_list(limit)
-    return [ApplicationResponse(**{k: v for k, v in app.items() if k != "score_details"}) for app in applications]
+    # score_details is never returned by the list view - keep it in Mongo
+    cursor = db.applications.find(
+        query, APPLICATION_LIST_PROJECTION
+    ).sort("match_score", -1).limit(limit).batch_size(LIST_BATCH_SIZE)
+    return model_list_response(APPLICATION_LIST_ADAPTER, [ApplicationResponse.model_construct(**app) async for app in cursor])
 
-@api_router.patch("/applications/{app_id}/status")
-async def update_application_status(app_id: str, status: str, current_user: dict = Depends(get_current_user)):
-    if current_user["role"] not in ["company", "admin"]:
-        raise HTTPException(status_code=403, detail="Only companies can update application status")
-    
-    # Get application details
-    application = await db.applications.find_one({"id": app_id}, {"_id": 0})
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
-    # Update status
-    result = await db.applications.update_one(
-        {"id": app_id},
-        {"$set": {"status": status}}
-    )
-    
-    if result.modified_count == 0:
-        return {"message": "Status already up to date"}
-    
-    # Send email notification to candidate
+async def notify_application_status_change(application: dict, status: str):
+    """Email the candidate and fire automation rules after a status change"""
     try:
-        candidate = await db.users.find_one({"id": application["candidate_id"]}, {"_id": 0})
-        job = await db.jobs.find_one({"id": application["job_id"]}, {"_id": 0})
+        candidate, job = await asyncio.gather(
+            db.users.find_one({"id": application["candidate_id"]}, {"_id": 0, "email": 1, "full_name": 1}),
+            db.jobs.find_one({"id": application["job_id"]}, {"_id": 0, "title": 1, "company_name": 1})
+        )
         
         if candidate and job:
-            await email_service.send_application_status_update(
-                candidate_email=candidate["email"],
+            # Bulk status changes go out as batched sends, not one per request
+            email_service.enqueue(candidate["email"], *email_service.render_application_status_update(
                 candidate_name=candidate["full_name"],
                 job_title=job["title"],
                 new_status=status,
                 company_name=job["company_name"]
-            )
+            ))
     except Exception as e:
-        logging.error(f"Failed to send status email: {str(e)}")
+        logging.error("Failed to queue status email: %s", e)
+    
+    try:
+        await automation_service.fire("application_status_changed", {
+            "application_id": application["id"],
+            "candidate_id": application["candidate_id"],
+            "job_id": application["job_id"],
+            "company_id": application.get("company_id"),
+            "previous_status": application.get("status"),
+            "status": status
+        })
+    except Exception as e:
+        logging.error("Automation rules failed: %s", e)
+
+@api_router.patch("/applications/{app_id}/status")
+async def update_application_status(
+    app_id: str,
+    status: str,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(require_role("company", "admin", detail="Only companies can update application status"))
+):
+    # Update status and get the previous document in one round-trip
+    application = await db.applications.find_one_and_update(
+        {"id": app_id},
+        {"$set": {"status": status}},
+        projection={"_id": 0, "id": 1, "candidate_id": 1, "job_id": 1, "company_id": 1, "status": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    
+    if application.get("status") == status:
+        return {"message": "Status already up to date"}
+    
+    # Email + automation run after the response is sent
+    background_tasks.add_task(notify_application_status_change, application, status)
     
     return {"message": "Status updated successfully"}
 
-@api_router.post("/referrals", response_model=ReferralResponse)
-async def create_referral(referral: ReferralCreate, current_user: dict = Depends(get_current_user)):
-    if current_user["role"] not in ["recruiter", "employee"]:
-        raise HTTPException(status_code=403, detail="Only recruiters and employees can make referrals")
+class BulkScoreRequest(BaseModel):
+    job_id: str
+    application_ids: Optional[List[str]] = None
+
+@api_router.post("/applications/bulk-score")
+async def bulk_score_applications(request: BulkScoreRequest, current_user: dict = Depends(REQUIRE_HIRING_TEAM)):
+    """Re-score all (or selected) applications for a job concurrently"""
+    job = await db.jobs.find_one({"id": request.job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if current_user["role"] == "company" and job["company_id"] != current_user["id"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    app_query = {"job_id": request.job_id}
+    if request.application_ids:
+        app_query["id"] = {"$in": request.application_ids}
+    job_desc = f"{job['title']} - {job['description']} Requirements: {' '.join(job['requirements'])}"
+    
+    scores = {}
+    failed = []
+    skipped = 0
+    
+    async def score_chunk(chunk: List[dict]) -> None:
+        nonlocal skipped
+        resumes = await db.resumes.find(
+            {"id": {"$in": list({a["resume_id"] for a in chunk})}},
+            {"_id": 0, "id": 1, "parsed_data": 1}
+        ).to_list(len(chunk))
+        resumes_by_id = {r["id"]: r for r in resumes}
+        
+        scorable = [a for a in chunk if a["resume_id"] in resumes_by_id]
+        skipped += len(chunk) - len(scorable)
+        results = await asyncio.gather(*[
+            score_resume_with_ai(resumes_by_id[a["resume_id"]]["parsed_data"], job_desc)
+            for a in scorable
+        ], return_exceptions=True)
+        
+        operations = []
+        for a, result in zip(scorable, results):
+            if isinstance(result, BaseException):
+                failed.append(a["id"])
+                continue
+            scores[a["id"]] = result.get('match_score', 50)
+            operations.append(UpdateOne(
+                {"id": a["id"]},
+                {"$set": {"match_score": scores[a["id"]], "score_details": result}}
+            ))
+        if operations:
+            await db.applications.bulk_write(operations, ordered=False)
+    
+    # Walk every matching application in chunks no larger than the limiter's
+    # concurrency, so a big job never queues past the acquire deadline; a
+    # chunk that still can't get capacity fails only its own applications
+    step = llm_limiter.max_concurrency
+    chunk = []
+    async for application in db.applications.find(app_query, {"_id": 0, "id": 1, "resume_id": 1}):
+        chunk.append(application)
+        if len(chunk) >= step:
+            await score_chunk(chunk)
+            chunk = []
+    if chunk:
+        await score_chunk(chunk)
     
+    return {
+        "job_id": request.job_id,
+        "scored": len(scores),
+        "skipped": skipped,
+        "failed": failed,
+        "scores": scores
+    }
+
+@api_router.post("/referrals", response_model=ReferralResponse)
+async def create_referral(
+    referral: ReferralCreate,
+    current_user: dict = Depends(require_role("recruiter", "employee", detail="Only recruiters and employees can make referrals"))
+):
     job = await db.jobs.find_one({"id": referral.job_id}, {"_id": 0})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    referral_id = str(uuid.uuid4())
+    referral_id = new_id()
     referral_doc = {
         "id": referral_id,
         "job_id": referral.job_id,
@@ -695,8 +1374,9 @@ async def create_referral(referral: ReferralCreate, current_user: dict = Depends
     }
     
     await db.referrals.insert_one(referral_doc)
+    cache_manager.invalidate_leaderboard()
     
-    return ReferralResponse(**{k: v for k, v in referral_doc.items() if k != "_id"})
+    return model_response(ReferralResponse.model_construct(**{k: v for k, v in referral_doc.items() if k != "_id"}))
 
 @api_router.get("/referrals", response_model=List[ReferralResponse])
 async def get_referrals(limit: int = 100, current_user: dict = Depends(get_current_user)):
@@ -704,13 +1384,20 @@ async def get_referrals(limit: int = 100, current_user: dict = Depends(get_curre
     if current_user["role"] in ["recruiter", "employee"]:
         query["referrer_id"] = current_user["id"]
     
-    referrals = await db.referrals.find(query, {"_id": 0}).limit(limit).to_list(limit)
-    return [ReferralResponse(**r) for r in referrals]
+    cursor = db.referrals.find(query, REFERRAL_LIST_PROJECTION).limit(limit).batch_size(LIST_BATCH_SIZE)
+    return model_list_response(REFERRAL_LIST_ADAPTER, [ReferralResponse.model_construct(**r) async for r in cursor])
 
 @api_router.get("/leaderboard", response_model=List[LeaderboardEntry])
-async def get_leaderboard(limit: int = 100):
+async def get_leaderboard(request: Request, limit: int = 100):
+    # Rankings move at human speed; serve the serialized body for up to a minute
+    hit = await cache_manager.get_leaderboard(limit=limit)
+    if hit is not None:
+        return etag_body_response(request, *hit)
+    
     # Use aggregation to join user data in one query
     pipeline = [
+        # Sorting on the index prefix lets $group read only lb_idx keys
+        {"$sort": {"referrer_id": 1}},
         {"$group": {
             "_id": "$referrer_id",
             "total_referrals": {"$sum": 1},
@@ -721,10 +1408,20 @@ async def get_leaderboard(limit: int = 100):
                 "$sum": {"$cond": [{"$eq": ["$status", "hired"]}, "$reward_amount", 0]}
             }
         }},
+        # $sort + $limit coalesce into a top-k sort, so only the ranked
+        # rows are numbered and joined to users
+        {"$sort": {"successful_referrals": -1, "total_earnings": -1}},
+        {"$limit": limit},
+        # $documentNumber keeps the existing 1..N ranking (no shared ranks on ties)
+        {"$setWindowFields": {
+            "sortBy": {"successful_referrals": -1, "total_earnings": -1},
+            "output": {"rank": {"$documentNumber": {}}}
+        }},
         {"$lookup": {
             "from": "users",
             "localField": "_id",
             "foreignField": "id",
+            "pipeline": [{"$project": {"_id": 0, "full_name": 1, "role": 1}}],
             "as": "user_info"
         }},
         {"$unwind": "$user_info"},
@@ -732,79 +1429,90 @@ async def get_leaderboard(limit: int = 100):
             "user_id": "$_id",
             "user_name": "$user_info.full_name",
             "role": "$user_info.role",
+            "rank": 1,
             "total_referrals": 1,
             "successful_referrals": 1,
             "total_earnings": 1,
             "_id": 0
-        }},
-        {"$sort": {"successful_referrals": -1, "total_earnings": -1}},
-        {"$limit": limit}
+        }}
     ]
     
-    leaderboard = await db.referrals.aggregate(pipeline).to_list(limit)
-    
-    # Assign ranks
-    for idx, entry in enumerate(leaderboard):
-        entry["rank"] = idx + 1
+    leaderboard = await reporting_db.referrals.aggregate(pipeline, hint=LEADERBOARD_INDEX).to_list(limit)
     
-    return [LeaderboardEntry(**entry) for entry in leaderboard]
+    body_and_etag = serialize_with_etag(leaderboard)
+    await cache_manager.set_leaderboard(body_and_etag, limit=limit)
+    return etag_body_response(request, *body_and_etag)
+
+# Single-pass total/active job and total/pending application counts
+JOB_COUNTS_GROUP = {"$group": {
+    "_id": None,
+    "total": {"$sum": 1},
+    "active": {"$sum": {"$cond": [{"$eq": ["$status", "active"]}, 1, 0]}}
+}}
+APPLICATION_COUNTS_GROUP = {"$group": {
+    "_id": None,
+    "total": {"$sum": 1},
+    "pending": {"$sum": {"$cond": [{"$eq": ["$status", "pending"]}, 1, 0]}}
+}}
 
 @api_router.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
     stats = DashboardStats()
     
     if current_user["role"] == "admin":
-        stats.total_jobs = await db.jobs.count_documents({})
-        stats.active_jobs = await db.jobs.count_documents({"status": "active"})
-        stats.total_applications = await db.applications.count_documents({})
-        stats.pending_applications = await db.applications.count_documents({"status": "pending"})
-        stats.total_candidates = await db.users.count_documents({"role": "candidate"})
-        stats.total_recruiters = await db.users.count_documents({"role": "recruiter"})
-        stats.total_companies = await db.users.count_documents({"role": "company"})
-    elif current_user["role"] == "company":
-        stats.total_jobs = await db.jobs.count_documents({"company_id": current_user["id"]})
-        stats.active_jobs = await db.jobs.count_documents({"company_id": current_user["id"], "status": "active"})
-        
-        # Use aggregation to count applications across all company jobs
-        pipeline = [
-            {"$match": {"company_id": current_user["id"]}},
-            {"$lookup": {
-                "from": "applications",
-                "localField": "id",
-                "foreignField": "job_id",
-                "as": "apps"
-            }},
-            {"$unwind": {"path": "$apps", "preserveNullAndEmptyArrays": False}},
-            {"$facet": {
-                "total": [{"$count": "count"}],
-                "pending": [
-                    {"$match": {"apps.status": "pending"}},
-                    {"$count": "count"}
-                ]
-            }}
+        # One single-pass $group per collection, run concurrently
+        jobs_pipeline = [JOB_COUNTS_GROUP]
+        apps_pipeline = [APPLICATION_COUNTS_GROUP]
+        users_pipeline = [
+            {"$match": {"role": {"$in": ["candidate", "recruiter", "company"]}}},
+            {"$group": {"_id": "$role", "count": {"$sum": 1}}}
         ]
         
-        result = await db.jobs.aggregate(pipeline).to_list(1)
-        if result:
-            stats.total_applications = result[0]["total"][0]["count"] if result[0]["total"] else 0
-            stats.pending_applications = result[0]["pending"][0]["count"] if result[0]["pending"] else 0
+        jobs_result, apps_result, users_result = await asyncio.gather(
+            reporting_db.jobs.aggregate(jobs_pipeline).to_list(1),
+            reporting_db.applications.aggregate(apps_pipeline).to_list(1),
+            reporting_db.users.aggregate(users_pipeline).to_list(3)
+        )
+        
+        if jobs_result:
+            stats.total_jobs = jobs_result[0]["total"]
+            stats.active_jobs = jobs_result[0]["active"]
+        if apps_result:
+            stats.total_applications = apps_result[0]["total"]
+            stats.pending_applications = apps_result[0]["pending"]
+        role_counts = {r["_id"]: r["count"] for r in users_result}
+        stats.total_candidates = role_counts.get("candidate", 0)
+        stats.total_recruiters = role_counts.get("recruiter", 0)
+        stats.total_companies = role_counts.get("company", 0)
+    elif current_user["role"] == "company":
+        company_match = {"$match": {"company_id": current_user["id"]}}
+        jobs_result, apps_result = await asyncio.gather(
+            reporting_db.jobs.aggregate([company_match, JOB_COUNTS_GROUP]).to_list(1),
+            # company_id lives on applications, so no $lookup through jobs
+            reporting_db.applications.aggregate([company_match, APPLICATION_COUNTS_GROUP]).to_list(1)
+        )
+        if jobs_result:
+            stats.total_jobs = jobs_result[0]["total"]
+            stats.active_jobs = jobs_result[0]["active"]
+        if apps_result:
+            stats.total_applications = apps_result[0]["total"]
+            stats.pending_applications = apps_result[0]["pending"]
     elif current_user["role"] == "candidate":
-        stats.total_applications = await db.applications.count_documents({"candidate_id": current_user["id"]})
-        stats.active_jobs = await db.jobs.count_documents({"status": "active"})
+        stats.total_applications, stats.active_jobs = await asyncio.gather(
+            reporting_db.applications.count_documents({"candidate_id": current_user["id"]}),
+            reporting_db.jobs.count_documents({"status": "active"})
+        )
     
     return stats
 
 @api_router.get("/users", response_model=List[UserResponse])
-async def get_users(role: Optional[str] = None, limit: int = 100, current_user: dict = Depends(get_current_user)):
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
+async def get_users(role: Optional[str] = None, limit: int = 100, current_user: dict = Depends(REQUIRE_ADMIN)):
     query = {}
     if role:
         query["role"] = role
     
-    users = await db.users.find(query, {"_id": 0, "password": 0}).limit(limit).to_list(limit)
-    return [UserResponse(**u) for u in users]
+    cursor = db.users.find(query, USER_LIST_PROJECTION).limit(limit).batch_size(LIST_BATCH_SIZE)
+    return model_list_response(USER_LIST_ADAPTER, [UserResponse.model_construct(**u) async for u in cursor])
 
 @api_router.patch("/users/{user_id}/currency")
 async def update_currency_preference(
@@ -823,21 +1531,31 @@ async def update_currency_preference(
         {"id": user_id},
         {"$set": {"currency_preference": currency}}
     )
+    invalidate_cached_user(user_id)
     
     return {"message": "Currency preference updated", "currency": currency}
 
+# Rates come from the shared fx_rates table, refreshed from FX_RATES_URL when set
+FX_RATES_URL = os.environ.get("FX_RATES_URL")
+FX_RATES_REFRESH_SECONDS = int(os.environ.get("FX_RATES_REFRESH_SECONDS", "300"))
+CURRENCY_RATES_TTL = 60
+_currency_rates_cache = LRUTTLCache(max_size=1, ttl_seconds=CURRENCY_RATES_TTL)
+_fx_refresh_task: Optional[asyncio.Task] = None
+
 @api_router.get("/settings/currency-rates")
 async def get_currency_rates():
     """Get current currency exchange rates"""
-    # In production, fetch from exchange rate API
-    return {
-        "base": "INR",
-        "rates": {
-            "USD": 0.012,  # 1 INR = 0.012 USD
-            "INR": 1.0
-        },
-        "updated_at": datetime.now().isoformat()
-    }
+    # Polled by the frontend; serialize at most once a minute and let
+    # browsers reuse the answer for as long
+    body = _currency_rates_cache.get("rates")
+    if body is None:
+        body = orjson.dumps(fx_rates.snapshot())
+        _currency_rates_cache.set("rates", body)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={CURRENCY_RATES_TTL}"}
+    )
 
 
 # ============= DOCUMENT MANAGEMENT ENDPOINTS =============
@@ -857,59 +1575,54 @@ async def process_gmail_session(
     
     try:
         # Get user data from Emergent Auth
-        async with httpx.AsyncClient() as client:
-            auth_response = await client.get(
-                EMERGENT_AUTH_URL,
-                headers={"X-Session-ID": x_session_id}
-            )
-            auth_response.raise_for_status()
-            user_data = auth_response.json()
+        auth_response = await auth_http_client.get(
+            EMERGENT_AUTH_URL,
+            headers={"X-Session-ID": x_session_id}
+        )
+        auth_response.raise_for_status()
+        user_data = auth_response.json()
         
         email = user_data["email"]
         
-        # Check domain restrictions
-        if not await check_domain_allowed(email):
+        if not is_domain_allowed(email, await get_domain_restrictions()):
             raise HTTPException(status_code=403, detail="Domain not allowed for registration")
         
-        # Check if user exists
-        user = await db.users.find_one({"email": email}, {"_id": 0})
-        
-        if not user:
-            # Create new user with Gmail OAuth
-            user_id = f"user_{uuid.uuid4().hex[:12]}"
-            user = {
-                "user_id": user_id,
-                "id": user_id,  # For compatibility with existing system
-                "email": email,
-                "full_name": user_data["name"],
-                "picture": user_data.get("picture"),
-                "role": "candidate",  # Default role
-                "currency_preference": "INR",
-                "auth_provider": "gmail",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            }
-            await db.users.insert_one(user)
-        else:
-            # Update existing user info
-            user_id = user.get("user_id") or user.get("id")
-            await db.users.update_one(
-                {"email": email},
-                {"$set": {
+        # Create or refresh the user in one atomic upsert; the unique email
+        # index makes concurrent first logins converge on one document
+        new_user_id = f"user_{secrets.token_hex(6)}"
+        now = datetime.now(timezone.utc)
+        user = await db.users.find_one_and_update(
+            {"email": email},
+            {
+                "$setOnInsert": {
+                    "user_id": new_user_id,
+                    "id": new_user_id,  # For compatibility with existing system
+                    "role": "candidate",  # Default role
+                    "currency_preference": "INR",
+                    "created_at": now.isoformat()
+                },
+                "$set": {
                     "full_name": user_data["name"],
                     "picture": user_data.get("picture"),
                     "auth_provider": "gmail"
-                }}
-            )
+                }
+            },
+            projection={"_id": 0, "password": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        user_id = user.get("user_id") or user["id"]
+        invalidate_cached_user(user["id"])
         
         # Create session
         session_token = user_data["session_token"]
-        expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+        expires_at = now + timedelta(days=7)
         
-        await db.user_sessions.insert_one({
+        await bulk_writers["user_sessions"].insert({
             "user_id": user_id,
             "session_token": session_token,
             "expires_at": expires_at,
-            "created_at": datetime.now(timezone.utc)
+            "created_at": now
         })
         
         # Set httpOnly cookie
@@ -923,16 +1636,13 @@ async def process_gmail_session(
             max_age=7 * 24 * 60 * 60  # 7 days
         )
         
-        # Get fresh user data
-        user_doc = await db.users.find_one({"email": email}, {"_id": 0, "password": 0})
-        
-        return {"message": "Authentication successful", "user": user_doc}
+        return {"message": "Authentication successful", "user": user}
         
     except httpx.HTTPError as e:
-        logging.error(f"Gmail OAuth error: {str(e)}")
+        logging.error("Gmail OAuth error: %s", e)
         raise HTTPException(status_code=400, detail="Invalid session ID")
     except Exception as e:
-        logging.error(f"Session processing error: {str(e)}")
+        logging.error("Session processing error: %s", e)
         raise HTTPException(status_code=500, detail="Authentication failed")
 
 @api_router.get("/auth/me-flexible")
@@ -949,6 +1659,7 @@ async def logout(response: Response, request: Request):
     if session_token:
         # Delete session from database
         await db.user_sessions.delete_one({"session_token": session_token})
+        _session_cache.delete(token_cache_key(session_token))
     
     # Clear cookie
     response.delete_cookie(key="session_token", path="/")
@@ -958,11 +1669,8 @@ async def logout(response: Response, request: Request):
 # ============= DOMAIN-BASED ACCESS CONTROL =============
 
 @api_router.get("/admin/domain-settings")
-async def get_domain_settings(current_user: dict = Depends(get_current_user)):
+async def get_domain_settings(current_user: dict = Depends(REQUIRE_ADMIN)):
     """Get domain restriction settings"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     settings = await db.platform_settings.find_one({"key": "domain_restrictions"}, {"_id": 0})
     if not settings:
         settings = {
@@ -977,12 +1685,9 @@ async def get_domain_settings(current_user: dict = Depends(get_current_user)):
 async def update_domain_settings(
     enabled: bool,
     allowed_domains: List[str],
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Update domain restriction settings"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     await db.platform_settings.update_one(
         {"key": "domain_restrictions"},
         {"$set": {
@@ -994,17 +1699,15 @@ async def update_domain_settings(
         }},
         upsert=True
     )
+    _settings_cache.delete("domain_restrictions")
     
     return {"message": "Domain settings updated successfully"}
 
 # ============= EMAIL AUTOMATION ENDPOINTS =============
 
 @api_router.get("/admin/emails/sent")
-async def get_sent_emails(limit: int = 50, current_user: dict = Depends(get_current_user)):
+async def get_sent_emails(limit: int = 50, current_user: dict = Depends(REQUIRE_ADMIN)):
     """Get list of sent emails (testing mode)"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     emails = email_service.get_sent_emails(limit)
     return {"emails": emails, "total": len(email_service.sent_emails)}
 
@@ -1013,12 +1716,9 @@ async def test_send_email(
     recipient_email: str,
     subject: str,
     content: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Test email sending"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     result = await email_service.send_email(
         to_email=recipient_email,
         subject=subject,
@@ -1037,17 +1737,14 @@ async def upload_document(
 ):
     """Upload and store document"""
     try:
-        file_id = str(uuid.uuid4())
+        file_id = new_id()
         file_extension = file.filename.split('.')[-1]
         filename = f"{file_id}.{file_extension}"
         filepath = os.path.join(UPLOAD_DIR, filename)
         
-        # Save file
-        with open(filepath, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Get file size
-        file_size = os.path.getsize(filepath)
+        # Copy in 1 MiB chunks on one worker thread rather than two
+        # thread hops (upload read + file write) per chunk
+        file_size = await asyncio.to_thread(save_upload, file.file, filepath)
         
         # Create document record
         doc_record = {
@@ -1063,7 +1760,7 @@ async def upload_document(
             "status": "active"
         }
         
-        await db.documents.insert_one(doc_record)
+        await bulk_writers["documents"].insert(doc_record)
         
         return {"message": "Document uploaded successfully", "document": {k: v for k, v in doc_record.items() if k != "_id"}}
     except Exception as e:
@@ -1083,90 +1780,100 @@ async def get_documents(
     if related_to:
         query["related_to"] = related_to
     
-    documents = await db.documents.find(query, {"_id": 0}).limit(limit).to_list(limit)
-    return documents
+    cursor = db.documents.find(query, {"_id": 0}).limit(limit).batch_size(LIST_BATCH_SIZE)
+    return [doc async for doc in cursor]
 
 @api_router.get("/documents/{doc_id}/download")
-async def download_document(doc_id: str, current_user: dict = Depends(get_current_user)):
+async def download_document(doc_id: str, request: Request, current_user: dict = Depends(get_current_user)):
     """Download document file"""
     doc = await db.documents.find_one({"id": doc_id}, {"_id": 0})
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    if not os.path.exists(doc["file_path"]):
-        raise HTTPException(status_code=404, detail="File not found")
-    
-    return FileResponse(
-        doc["file_path"],
-        filename=doc["name"],
-        media_type="application/octet-stream"
-    )
+    return file_download_response(request, doc["file_path"], doc["name"], "application/octet-stream")
 
 # ============= ATS (Applicant Tracking System) ENDPOINTS =============
 
 @api_router.get("/ats/stages")
 async def get_ats_stages():
     """Get all ATS stages"""
-    return ATS_STAGES
+    return Response(content=ATS_STAGES_JSON, media_type="application/json")
 
 @api_router.get("/ats/pipeline/{application_id}")
 async def get_ats_pipeline(application_id: str, current_user: dict = Depends(get_current_user)):
     """Get ATS pipeline for an application"""
-    pipeline = await db.ats_pipelines.find_one({"application_id": application_id}, {"_id": 0})
-    if not pipeline:
-        # Create initial pipeline
-        application = await db.applications.find_one({"id": application_id}, {"_id": 0})
-        if not application:
-            raise HTTPException(status_code=404, detail="Application not found")
-        
-        pipeline = {
+    # Application and its pipeline (if any) in one round-trip
+    rows = await db.applications.aggregate([
+        {"$match": {"id": application_id}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "ats_pipelines",
+            "localField": "id",
+            "foreignField": "application_id",
+            "pipeline": [{"$project": {"_id": 0}}],
+            "as": "pipeline"
+        }},
+        {"$project": {"_id": 0, "created_at": 1, "pipeline": 1}}
+    ]).to_list(1)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Application not found")
+    
+    if rows[0]["pipeline"]:
+        return rows[0]["pipeline"][0]
+    
+    # Create initial pipeline; upsert + unique application_id index makes
+    # concurrent first reads converge on a single document
+    pipeline = await db.ats_pipelines.find_one_and_update(
+        {"application_id": application_id},
+        {"$setOnInsert": {
             "application_id": application_id,
             "current_stage": "applied",
             "stage_history": [{
                 "stage": "applied",
-                "entered_at": application["created_at"],
+                "entered_at": rows[0]["created_at"],
                 "notes": "Application submitted"
             }],
             "days_in_current_stage": 0,
             "total_days_in_pipeline": 0,
             "next_action": "Review application",
             "scheduled_interviews": []
-        }
-        await db.ats_pipelines.insert_one(pipeline)
+        }},
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
     
-    return {k: v for k, v in pipeline.items() if k != "_id"}
+    return pipeline
 
 @api_router.post("/ats/pipeline/{application_id}/move")
 async def move_ats_stage(
     application_id: str,
     new_stage: str,
     notes: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("company", "admin", detail="Only companies can move stages"))
 ):
     """Move application to new stage"""
-    if current_user["role"] not in ["company", "admin"]:
-        raise HTTPException(status_code=403, detail="Only companies can move stages")
-    
-    pipeline = await db.ats_pipelines.find_one({"application_id": application_id})
-    if not pipeline:
-        raise HTTPException(status_code=404, detail="Pipeline not found")
+    if new_stage not in ATS_STAGE_IDS:
+        raise HTTPException(status_code=400, detail=f"Unknown stage: {new_stage}")
     
-    # Update stage history
+    # Update stage history; the match count doubles as the existence check
     stage_entry = {
         "stage": new_stage,
         "entered_at": datetime.now(timezone.utc).isoformat(),
         "notes": notes or f"Moved to {new_stage}"
     }
     
-    await db.ats_pipelines.update_one(
+    result = await db.ats_pipelines.update_one(
         {"application_id": application_id},
         {
             "$set": {"current_stage": new_stage},
             "$push": {"stage_history": stage_entry}
         }
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
     
-    # Update application status
+    # Update application status (only once the pipeline is known to exist)
     await db.applications.update_one(
         {"id": application_id},
         {"$set": {"status": new_stage}}
@@ -1180,17 +1887,14 @@ async def move_ats_stage(
 async def create_bgv_request(
     application_id: str,
     verification_types: List[str],
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("company", "admin", detail="Only companies can request BGV"))
 ):
     """Create background verification request"""
-    if current_user["role"] not in ["company", "admin"]:
-        raise HTTPException(status_code=403, detail="Only companies can request BGV")
-    
     application = await db.applications.find_one({"id": application_id}, {"_id": 0})
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    bgv_id = str(uuid.uuid4())
+    bgv_id = new_id()
     bgv_request = {
         "id": bgv_id,
         "candidate_id": application["candidate_id"],
@@ -1207,12 +1911,14 @@ async def create_bgv_request(
         "verified_by": None
     }
     
-    await db.bgv_requests.insert_one(bgv_request)
+    await bulk_writers["bgv_requests"].insert(bgv_request)
+    cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
     
     return {"message": "BGV request created", "bgv_id": bgv_id}
 
 @api_router.get("/bgv/requests")
 async def get_bgv_requests(
+    request: Request,
     status: Optional[str] = None,
     limit: int = 100,
     current_user: dict = Depends(get_current_user)
@@ -1224,8 +1930,16 @@ async def get_bgv_requests(
     if current_user["role"] == "company":
         query["requested_by"] = current_user["id"]
     
-    requests = await db.bgv_requests.find(query, {"_id": 0}).limit(limit).to_list(limit)
-    return requests
+    cursor = db.bgv_requests.find(query, {"_id": 0}).limit(limit).batch_size(LIST_BATCH_SIZE)
+    if wants_ndjson(request):
+        return ndjson_response(cursor)
+    
+    hit = await cached_list_response(request, CacheKeys.BGV_REQUESTS, current_user, status=status, limit=limit)
+    if hit is not None:
+        return hit
+    
+    requests = await cursor.to_list(limit)
+    return await cache_list_response(request, CacheKeys.BGV_REQUESTS, current_user, requests, status=status, limit=limit)
 
 @api_router.post("/bgv/{bgv_id}/check")
 async def complete_bgv_check(
@@ -1234,43 +1948,47 @@ async def complete_bgv_check(
     check_status: str,
     verified_data: dict,
     remarks: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("admin", "bgv", detail="Only BGV team can complete checks"))
 ):
     """Complete a BGV check"""
-    if current_user["role"] not in ["admin", "bgv"]:
-        raise HTTPException(status_code=403, detail="Only BGV team can complete checks")
-    
-    bgv_request = await db.bgv_requests.find_one({"id": bgv_id})
-    if not bgv_request:
-        raise HTTPException(status_code=404, detail="BGV request not found")
-    
-    # Update BGV request
-    await db.bgv_requests.update_one(
+    # One atomic pipeline update: record the check (idempotent on resubmits),
+    # drop it from pending and flip to completed once nothing is pending.
+    # Client values go through $literal so they are never read as field paths.
+    check = {"$literal": check_type}
+    remaining_empty = {"$eq": [{"$size": "$checks_pending"}, 0]}
+    updated = await db.bgv_requests.find_one_and_update(
         {"id": bgv_id},
-        {
-            "$push": {"checks_completed": check_type},
-            "$pull": {"checks_pending": check_type},
-            "$set": {
-                "status": "in_progress",
-                "verified_by": current_user["id"]
-            }
-        }
+        [
+            {"$set": {
+                "checks_completed": {"$setUnion": [{"$ifNull": ["$checks_completed", []]}, [check]]},
+                "checks_pending": {"$filter": {
+                    "input": {"$ifNull": ["$checks_pending", []]},
+                    "as": "pending",
+                    "cond": {"$ne": ["$$pending", check]}
+                }}
+            }},
+            {"$set": {
+                "status": {"$cond": [remaining_empty, "completed", "in_progress"]},
+                "completed_at": {"$cond": [
+                    remaining_empty,
+                    {"$ifNull": ["$completed_at", datetime.now(timezone.utc).isoformat()]},
+                    "$completed_at"
+                ]},
+                "verified_by": {"$literal": current_user["id"]}
+            }}
+        ],
+        projection={"_id": 0, "status": 1, "checks_pending": 1},
+        return_document=ReturnDocument.AFTER
     )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="BGV request not found")
+    cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
     
-    # Check if all completed
-    updated_bgv = await db.bgv_requests.find_one({"id": bgv_id})
-    if not updated_bgv["checks_pending"]:
-        await db.bgv_requests.update_one(
-            {"id": bgv_id},
-            {
-                "$set": {
-                    "status": "completed",
-                    "completed_at": datetime.now(timezone.utc).isoformat()
-                }
-            }
-        )
-    
-    return {"message": "BGV check completed"}
+    return {
+        "message": "BGV check completed",
+        "status": updated["status"],
+        "checks_pending": updated["checks_pending"]
+    }
 
 # ============= 91-DAY TRACKING ENDPOINTS =============
 
@@ -1278,18 +1996,19 @@ async def complete_bgv_check(
 async def start_candidate_tracking(
     application_id: str,
     join_date: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("company", "admin", detail="Only companies can start tracking"))
 ):
     """Start 91-day tracking for hired candidate"""
-    if current_user["role"] not in ["company", "admin"]:
-        raise HTTPException(status_code=403, detail="Only companies can start tracking")
-    
     application = await db.applications.find_one({"id": application_id}, {"_id": 0})
     if not application or application["status"] != "hired":
         raise HTTPException(status_code=400, detail="Application must be in hired status")
     
-    tracking_id = str(uuid.uuid4())
-    join_date_obj = datetime.fromisoformat(join_date)
+    try:
+        join_date_obj = datetime.fromisoformat(join_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="join_date must be an ISO 8601 date")
+    
+    tracking_id = new_id()
     end_date = join_date_obj + timedelta(days=91)
     
     # Create milestones
@@ -1306,6 +2025,10 @@ async def start_candidate_tracking(
         "application_id": application_id,
         "job_id": application["job_id"],
         "company_id": current_user["id"],
+        # Display names copied here so invoicing needs no extra lookups
+        "company_name": current_user["full_name"],
+        "candidate_name": application.get("candidate_name"),
+        "job_title": application.get("job_title"),
         "join_date": join_date,
         "tracking_start_date": join_date,
         "tracking_end_date": end_date.isoformat(),
@@ -1317,130 +2040,292 @@ async def start_candidate_tracking(
         "invoice_generated": False
     }
     
-    await db.candidate_tracking.insert_one(tracking)
+    await bulk_writers["candidate_tracking"].insert(tracking)
+    cache_manager.invalidate_list(CacheKeys.TRACKING)
+    _tracking_advanced.clear()
     
     return {"message": "Tracking started", "tracking_id": tracking_id}
 
+# Whole days elapsed since join_date, then flip finished records to completed.
+# All date math runs in Mongo, so reads do no per-record parsing in Python;
+# an unparseable join_date yields a null day instead of failing the batch.
+TRACKING_JOIN_DATE_EXPR = {"$convert": {"input": "$join_date", "to": "date", "onError": None, "onNull": None}}
+TRACKING_ADVANCE_PIPELINE = [
+    {"$set": {"current_day": {"$toInt": {"$floor": {"$divide": [
+        {"$subtract": ["$$NOW", TRACKING_JOIN_DATE_EXPR]},
+        24 * 60 * 60 * 1000
+    ]}}}}},
+    {"$set": {
+        "status": {"$cond": [{"$gte": ["$current_day", 91]}, "completed", "$status"]},
+        "invoice_eligible": {"$cond": [{"$gte": ["$current_day", 91]}, True, "$invoice_eligible"]}
+    }}
+]
+
 @api_router.get("/tracking")
 async def get_tracking_records(
+    request: Request,
     status: Optional[str] = None,
     limit: int = 100,
     current_user: dict = Depends(get_current_user)
 ):
     """Get tracking records"""
-    query = {}
-    if status:
-        query["status"] = status
+    streaming = wants_ndjson(request)
+    if not streaming:
+        hit = await cached_list_response(request, CacheKeys.TRACKING, current_user, status=status, limit=limit)
+        if hit is not None:
+            return hit
+    
+    scope = {}
     if current_user["role"] == "company":
-        query["company_id"] = current_user["id"]
+        scope["company_id"] = current_user["id"]
     elif current_user["role"] == "candidate":
-        query["candidate_id"] = current_user["id"]
+        scope["candidate_id"] = current_user["id"]
+    
+    # Advance current_day for every active record server-side and close
+    # out the ones that reached day 91, in a single update. Days tick over
+    # once a day, so each scope is advanced at most once a minute.
+    scope_key = ",".join(f"{field}={value}" for field, value in scope.items()) or "all"
+    if _tracking_advanced.get(scope_key) is None:
+        await db.candidate_tracking.update_many(
+            {**scope, "status": "tracking"},
+            TRACKING_ADVANCE_PIPELINE
+        )
+        _tracking_advanced.set(scope_key, True)
     
-    # Update current_day for active tracking
-    tracking_records = await db.candidate_tracking.find(query, {"_id": 0}).limit(limit).to_list(limit)
+    query = dict(scope)
+    if status:
+        query["status"] = status
     
-    for record in tracking_records:
-        if record["status"] == "tracking":
-            join_date = datetime.fromisoformat(record["join_date"])
-            current_day = (datetime.now(timezone.utc).replace(tzinfo=None) - join_date).days
-            record["current_day"] = current_day
-            
-            # Check if 91 days completed
-            if current_day >= 91:
-                await db.candidate_tracking.update_one(
-                    {"id": record["id"]},
-                    {"$set": {"status": "completed", "invoice_eligible": True, "current_day": current_day}}
-                )
-                record["status"] = "completed"
-                record["invoice_eligible"] = True
+    cursor = db.candidate_tracking.find(query, {"_id": 0}).limit(limit).batch_size(LIST_BATCH_SIZE)
+    if streaming:
+        return ndjson_response(cursor)
     
-    return tracking_records
+    tracking_records = await cursor.to_list(limit)
+    return await cache_list_response(request, CacheKeys.TRACKING, current_user, tracking_records, status=status, limit=limit)
 
 @api_router.post("/tracking/{tracking_id}/milestone")
 async def complete_milestone(
     tracking_id: str,
     day: int,
     feedback: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("company", "admin", detail="Only companies can complete milestones"))
 ):
     """Complete a tracking milestone"""
-    if current_user["role"] not in ["company", "admin"]:
-        raise HTTPException(status_code=403, detail="Only companies can complete milestones")
-    
-    tracking = await db.candidate_tracking.find_one({"id": tracking_id})
-    if not tracking:
-        raise HTTPException(status_code=404, detail="Tracking record not found")
-    
-    # Update milestone
-    milestones = tracking["milestones"]
-    for milestone in milestones:
-        if milestone["day"] == day:
-            milestone["status"] = "completed"
-            milestone["completed_at"] = datetime.now(timezone.utc).isoformat()
-            milestone["feedback"] = feedback
-    
-    # Add feedback record
+    now_iso = datetime.now(timezone.utc).isoformat()
     feedback_record = {
         "day": day,
         "feedback": feedback,
-        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "recorded_at": now_iso,
         "recorded_by": current_user["id"]
     }
     
-    await db.candidate_tracking.update_one(
-        {"id": tracking_id},
-        {
-            "$set": {"milestones": milestones},
-            "$push": {"feedback_records": feedback_record}
-        }
-    )
+    # Update the milestone and append the feedback record server-side in one
+    # atomic pipeline update; $literal keeps user text from being read as
+    # an expression
+    result = await db.candidate_tracking.update_one(
+        {"id": tracking_id},
+        [{"$set": {
+            "milestones": {"$map": {
+                "input": "$milestones",
+                "as": "m",
+                "in": {"$cond": [
+                    {"$eq": ["$$m.day", day]},
+                    {"$mergeObjects": ["$$m", {
+                        "status": "completed",
+                        "completed_at": now_iso,
+                        "feedback": {"$literal": feedback}
+                    }]},
+                    "$$m"
+                ]}
+            }},
+            "feedback_records": {"$concatArrays": [
+                {"$ifNull": ["$feedback_records", []]},
+                [{"$literal": feedback_record}]
+            ]}
+        }}]
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Tracking record not found")
+    
+    cache_manager.invalidate_list(CacheKeys.TRACKING)
+    
+    return {"message": "Milestone completed"}
+
+# ============= INVOICE ENDPOINTS =============
+
+INVOICE_TAX_RATE = Decimal("0.18")  # 18% GST
+
+INVOICE_TRACKING_PROJECTION = {
+    "_id": 0, "id": 1, "company_id": 1, "application_id": 1, "invoice_eligible": 1,
+    "invoice_generated": 1, "company_name": 1, "candidate_name": 1, "job_title": 1
+}
+
+async def create_invoice_for_tracking(tracking: dict, amount: float, payment_terms: str) -> dict:
+    """Build, render and store the invoice for a claimed tracking record"""
+    tracking_id = tracking["id"]
+    
+    # Currency preference is read live; display names come from the tracking
+    # record (older records without them fall back to the application)
+    company_lookup = db.users.find_one(
+        {"id": tracking["company_id"]}, {"_id": 0, "full_name": 1, "currency_preference": 1}
+    )
+    if tracking.get("candidate_name") and tracking.get("job_title"):
+        company = await company_lookup
+        application = {"candidate_name": tracking["candidate_name"], "job_title": tracking["job_title"]}
+    else:
+        # Independent lookups; overlap the round trips
+        company, application = await asyncio.gather(
+            company_lookup,
+            db.applications.find_one(
+                {"id": tracking["application_id"]}, {"_id": 0, "candidate_name": 1, "job_title": 1}
+            )
+        )
+    
+    # Get company's currency preference
+    currency = company.get("currency_preference", "INR")
+    if not fx_rates.supports(currency):
+        # Bill in the base currency rather than failing the invoice
+        logging.warning("No FX rate for %s (company %s); invoicing in INR", currency, tracking["company_id"])
+        currency = "INR"
+    currency_symbol = "₹" if currency == "INR" else "$"
+    
+    # Convert from INR and round to the cent in Decimal; stored as float
+    # since BSON has no native Decimal
+    amount_dec = fx_rates.convert(amount, currency)
+    tax_dec = to_money(amount_dec * INVOICE_TAX_RATE)
+    amount = float(amount_dec)
+    tax_amount = float(tax_dec)
+    total_amount = float(amount_dec + tax_dec)
+    
+    # One clock read for the number, issue and due dates
+    now = datetime.now()
+    invoice_id = new_id()
+    invoice_number = f"INV-{now:%Y%m}-{secrets.token_hex(4).upper()}"
+    
+    invoice_data = {
+        "id": invoice_id,
+        "invoice_number": invoice_number,
+        "company_id": tracking["company_id"],
+        "company_name": company["full_name"],
+        "candidate_tracking_id": tracking_id,
+        "candidate_name": application["candidate_name"],
+        "job_title": application["job_title"],
+        "amount": amount,
+        "tax_amount": tax_amount,
+        "total_amount": total_amount,
+        "currency": currency,
+        "currency_symbol": currency_symbol,
+        "issue_date": f"{now:%Y-%m-%d}",
+        "due_date": f"{now + timedelta(days=30):%Y-%m-%d}",
+        "status": "sent",
+        "payment_terms": payment_terms,
+        "items": [
+            {
+                "description": f"Recruitment services for {application['candidate_name']} - {application['job_title']}",
+                "quantity": 1,
+                "rate": amount,
+                "amount": amount
+            }
+        ],
+        "notes": "Thank you for using HiringReferrals platform. Payment is due within 30 days."
+    }
+    
+    # Generate PDF
+    try:
+        loop = asyncio.get_running_loop()
+        pdf_path = await asyncio.wait_for(
+            loop.run_in_executor(_pdf_pool, render_invoice_pdf, invoice_data, invoice_generator.output_dir),
+            timeout=INVOICE_PDF_TIMEOUT
+        )
+        invoice_data["pdf_path"] = pdf_path
+    except Exception as e:
+        logging.error("PDF generation failed: %s", e)
     
-    return {"message": "Milestone completed"}
-
-# ============= INVOICE ENDPOINTS =============
+    await bulk_writers["invoices"].insert(invoice_data)
+    cache_manager.invalidate_list(CacheKeys.INVOICES)
+    return invoice_data
 
 @api_router.post("/invoices/generate")
 async def generate_invoice(
     tracking_id: str,
     amount: float,
     payment_terms: str = "Net 30",
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("admin", detail="Only admin can generate invoices"))
 ):
     """Generate invoice for completed tracking"""
-    if current_user["role"] not in ["admin"]:
-        raise HTTPException(status_code=403, detail="Only admin can generate invoices")
-    
-    tracking = await db.candidate_tracking.find_one({"id": tracking_id}, {"_id": 0})
+    # Atomically claim the record; a concurrent double-submit finds nothing to claim
+    tracking = await db.candidate_tracking.find_one_and_update(
+        {"id": tracking_id, "invoice_eligible": True, "invoice_generated": {"$ne": True}},
+        {"$set": {"invoice_generated": True}},
+        projection=INVOICE_TRACKING_PROJECTION,
+        return_document=ReturnDocument.BEFORE
+    )
     if not tracking:
-        raise HTTPException(status_code=404, detail="Tracking record not found")
-    
-    if not tracking["invoice_eligible"]:
-        raise HTTPException(status_code=400, detail="Tracking not eligible for invoice")
-    
-    if tracking["invoice_generated"]:
+        existing = await db.candidate_tracking.find_one({"id": tracking_id}, {"_id": 0, "invoice_eligible": 1})
+        if not existing:
+            raise HTTPException(status_code=404, detail="Tracking record not found")
+        if not existing.get("invoice_eligible"):
+            raise HTTPException(status_code=400, detail="Tracking not eligible for invoice")
         raise HTTPException(status_code=400, detail="Invoice already generated")
     
-    # Get company and job details
-    company = await db.users.find_one({"id": tracking["company_id"]}, {"_id": 0})
-    application = await db.applications.find_one({"id": tracking["application_id"]}, {"_id": 0})
-    
-    # Get company's currency preference
-    currency = company.get("currency_preference", "INR")
-    currency_symbol = "₹" if currency == "INR" else "$"
+    try:
+        invoice_data = await create_invoice_for_tracking(tracking, amount, payment_terms)
+    except Exception:
+        # Release the claim so the invoice can be retried
+        await db.candidate_tracking.update_one({"id": tracking_id}, {"$set": {"invoice_generated": False}})
+        raise
+    finally:
+        cache_manager.invalidate_list(CacheKeys.TRACKING)
     
-    # Convert amount if needed
-    if currency == "USD":
-        # Convert INR to USD (1 INR = 0.012 USD approximately)
-        amount = amount * 0.012
+    return {
+        "message": "Invoice generated",
+        "invoice_id": invoice_data["id"],
+        "invoice_number": invoice_data["invoice_number"],
+        "currency": invoice_data["currency"]
+    }
+
+@api_router.get("/invoices")
+async def get_invoices(
+    request: Request,
+    status: Optional[str] = None,
+    limit: int = 100,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get invoices"""
+    query = {}
+    if status:
+        query["status"] = status
+    if current_user["role"] == "company":
+        query["company_id"] = current_user["id"]
     
-    invoice_id = str(uuid.uuid4())
-    invoice_number = f"INV-{datetime.now().strftime('%Y%m')}-{str(uuid.uuid4())[:8].upper()}"
+    cursor = db.invoices.find(query, {"_id": 0}).limit(limit).batch_size(LIST_BATCH_SIZE)
+    if wants_ndjson(request):
+        return ndjson_response(cursor)
     
-    tax_rate = 0.18  # 18% GST
-    tax_amount = amount * tax_rate
-    total_amount = amount + tax_amount
+    hit = await cached_list_response(request, CacheKeys.INVOICES, current_user, status=status, limit=limit)
+    if hit is not None:
+        return hit
     
+    invoices = await cursor.to_list(limit)
+    return await cache_list_response(request, CacheKeys.INVOICES, current_user, invoices, status=status, limit=limit)
 
+@api_router.get("/invoices/{invoice_id}/download")
+async def download_invoice(invoice_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """Download invoice PDF"""
+    invoice = await db.invoices.find_one({"id": invoice_id}, {"_id": 0})
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    
+    if not invoice.get("pdf_path"):
+        raise HTTPException(status_code=404, detail="Invoice PDF not found")
+    
+    return file_download_response(
+        request,
+        invoice["pdf_path"],
+        f"invoice_{invoice['invoice_number']}.pdf",
+        "application/pdf",
+        not_found_detail="Invoice PDF not found"
+    )
 
 # ============= GAMIFICATION ENDPOINTS =============
 
@@ -1478,12 +2363,9 @@ async def update_user_streak_endpoint(user_id: str, current_user: dict = Depends
 async def award_achievement_endpoint(
     user_id: str,
     achievement_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Award an achievement to a user"""
-    if current_user["role"] not in ["admin"]:
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     result = await gamification_service.award_achievement(user_id, achievement_id)
     return result
 
@@ -1503,92 +2385,12 @@ async def get_user_gamification_stats(user_id: str, current_user: dict = Depends
 async def calculate_user_commission(
     user_id: str,
     base_amount: float,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("admin", "company", detail="Not authorized"))
 ):
     """Calculate commission based on user's level"""
-    if current_user["role"] not in ["admin", "company"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     commission = await gamification_service.calculate_commission(user_id, base_amount)
     return commission
 
-    invoice_data = {
-        "id": invoice_id,
-        "invoice_number": invoice_number,
-        "company_id": tracking["company_id"],
-        "company_name": company["full_name"],
-        "candidate_tracking_id": tracking_id,
-        "candidate_name": application["candidate_name"],
-        "job_title": application["job_title"],
-        "amount": amount,
-        "tax_amount": tax_amount,
-        "total_amount": total_amount,
-        "currency": currency,
-        "currency_symbol": currency_symbol,
-        "issue_date": datetime.now().strftime("%Y-%m-%d"),
-        "due_date": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-        "status": "sent",
-        "payment_terms": payment_terms,
-        "items": [
-            {
-                "description": f"Recruitment services for {application['candidate_name']} - {application['job_title']}",
-                "quantity": 1,
-                "rate": amount,
-                "amount": amount
-            }
-        ],
-        "notes": "Thank you for using HiringReferrals platform. Payment is due within 30 days."
-    }
-    
-    # Generate PDF
-    try:
-        pdf_path = invoice_generator.generate_invoice(invoice_data)
-        invoice_data["pdf_path"] = pdf_path
-    except Exception as e:
-        logging.error(f"PDF generation failed: {str(e)}")
-    
-    await db.invoices.insert_one(invoice_data)
-    
-    # Mark tracking as invoiced
-    await db.candidate_tracking.update_one(
-        {"id": tracking_id},
-        {"$set": {"invoice_generated": True}}
-    )
-    
-    return {"message": "Invoice generated", "invoice_id": invoice_id, "invoice_number": invoice_number, "currency": currency}
-
-@api_router.get("/invoices")
-async def get_invoices(
-    status: Optional[str] = None,
-    limit: int = 100,
-    current_user: dict = Depends(get_current_user)
-):
-    """Get invoices"""
-    query = {}
-    if status:
-        query["status"] = status
-    if current_user["role"] == "company":
-        query["company_id"] = current_user["id"]
-    
-    invoices = await db.invoices.find(query, {"_id": 0}).limit(limit).to_list(limit)
-    return invoices
-
-@api_router.get("/invoices/{invoice_id}/download")
-async def download_invoice(invoice_id: str, current_user: dict = Depends(get_current_user)):
-    """Download invoice PDF"""
-    invoice = await db.invoices.find_one({"id": invoice_id}, {"_id": 0})
-    if not invoice:
-        raise HTTPException(status_code=404, detail="Invoice not found")
-    
-    if not invoice.get("pdf_path") or not os.path.exists(invoice["pdf_path"]):
-        raise HTTPException(status_code=404, detail="Invoice PDF not found")
-    
-    return FileResponse(
-        invoice["pdf_path"],
-        filename=f"invoice_{invoice['invoice_number']}.pdf",
-        media_type="application/pdf"
-    )
-
 # ============= AUTOMATION ENDPOINTS =============
 
 @api_router.post("/automation/rules")
@@ -1598,13 +2400,10 @@ async def create_automation_rule(
     trigger_type: str,
     trigger_config: dict,
     actions: List[dict],
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_role("admin", detail="Only admin can create automation rules"))
 ):
     """Create automation rule"""
-    if current_user["role"] not in ["admin"]:
-        raise HTTPException(status_code=403, detail="Only admin can create automation rules")
-    
-    rule_id = str(uuid.uuid4())
+    rule_id = new_id()
     rule = {
         "id": rule_id,
         "name": name,
@@ -1619,37 +2418,37 @@ async def create_automation_rule(
         "run_count": 0
     }
     
-    await db.automation_rules.insert_one(rule)
+    await bulk_writers["automation_rules"].insert(rule)
+    automation_service.register(rule)
     
     return {"message": "Automation rule created", "rule_id": rule_id}
 
 @api_router.get("/automation/rules")
-async def get_automation_rules(limit: int = 100, current_user: dict = Depends(get_current_user)):
+async def get_automation_rules(request: Request, limit: int = 100, current_user: dict = Depends(REQUIRE_ADMIN)):
     """Get automation rules"""
-    if current_user["role"] not in ["admin"]:
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     rules = await db.automation_rules.find({}, {"_id": 0}).limit(limit).to_list(limit)
-    return rules
+    return etag_json_response(request, rules)
 
 # ============= BACKUP & EXPORT ENDPOINTS =============
 
+async def database_collections() -> Dict[str, Any]:
+    """The database's collections by name, listed at most once a minute"""
+    collections = _collections_cache.get("collections")
+    if collections is None:
+        collections = {name: db[name] for name in await db.list_collection_names()}
+        _collections_cache.set("collections", collections)
+    return collections
+
 @api_router.get("/admin/database/status")
-async def get_database_status(current_user: dict = Depends(get_current_user)):
+async def get_database_status(current_user: dict = Depends(REQUIRE_ADMIN)):
     """Get database connection status and statistics"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     try:
         # Get collection stats
-        collections = await db.list_collection_names()
-        collection_stats = {}
-        total_documents = 0
-        
-        for col_name in collections:
-            count = await db[col_name].count_documents({})
-            collection_stats[col_name] = count
-            total_documents += count
+        collections = await database_collections()
+        # Metadata counts, all collections at once - no scans, one RTT of latency
+        counts = await asyncio.gather(*(collection.estimated_document_count() for collection in collections.values()))
+        collection_stats = dict(zip(collections, counts))
+        total_documents = sum(counts)
         
         return {
             "status": "connected",
@@ -1667,32 +2466,37 @@ async def get_database_status(current_user: dict = Depends(get_current_user)):
             "checked_at": datetime.now(timezone.utc).isoformat()
         }
 
+# Collections fetched at once by the JSON export
+EXPORT_CONCURRENCY = 8
+# Mongo stringifies _id, so no ObjectId is decoded only to be str()'d
+EXPORT_PIPELINE = [{"$addFields": {"_id": {"$toString": "$_id"}}}]
+
+def write_json_export(path: str, data) -> None:
+    """Write one small export file (blocking; run in a thread)"""
+    # orjson encodes datetimes natively; default=str covers ObjectId
+    body = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write(body)
+
 @api_router.post("/admin/database/export")
-async def export_database_to_json(current_user: dict = Depends(get_current_user)):
+async def export_database_to_json(current_user: dict = Depends(REQUIRE_ADMIN)):
     """Export all collections to JSON files"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    import json as json_module
     export_dir = "/app/database_export"
     os.makedirs(export_dir, exist_ok=True)
     
-    collections = await db.list_collection_names()
-    results = {}
+    collections = await database_collections()
+    # Bounded so a large database cannot take over the Mongo pool
+    slots = asyncio.Semaphore(EXPORT_CONCURRENCY)
     
-    for col_name in collections:
-        documents = await db[col_name].find({}).to_list(10000)
-        
-        # Convert ObjectId to string
-        for doc in documents:
-            if '_id' in doc:
-                doc['_id'] = str(doc['_id'])
-        
+    async def export_one(col_name: str, collection) -> int:
         filepath = os.path.join(export_dir, f"{col_name}.json")
-        with open(filepath, 'w') as f:
-            json_module.dump(documents, f, indent=2, default=str)
-        
-        results[col_name] = len(documents)
+        async with slots:
+            return await stream_json_array(
+                filepath, collection.aggregate(EXPORT_PIPELINE, allowDiskUse=True, batchSize=LIST_BATCH_SIZE)
+            )
+    
+    counts = await asyncio.gather(*(export_one(name, collection) for name, collection in collections.items()))
+    results = dict(zip(collections, counts))
     
     # Save summary
     summary = {
@@ -1702,8 +2506,7 @@ async def export_database_to_json(current_user: dict = Depends(get_current_user)
         "total_documents": sum(results.values())
     }
     
-    with open(os.path.join(export_dir, "_summary.json"), 'w') as f:
-        json_module.dump(summary, f, indent=2)
+    await asyncio.to_thread(write_json_export, os.path.join(export_dir, "_summary.json"), summary)
     
     return {
         "message": "Database exported successfully",
@@ -1714,39 +2517,28 @@ async def export_database_to_json(current_user: dict = Depends(get_current_user)
     }
 
 @api_router.get("/admin/database/collections")
-async def list_database_collections(current_user: dict = Depends(get_current_user)):
+async def list_database_collections(current_user: dict = Depends(REQUIRE_ADMIN)):
     """List all database collections with document counts"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    collections = await db.list_collection_names()
-    result = []
-    
-    for col_name in sorted(collections):
-        count = await db[col_name].count_documents({})
-        result.append({
-            "name": col_name,
-            "document_count": count
-        })
+    collections = await database_collections()
+    names = sorted(collections)
+    # Metadata counts; count_documents({}) would scan every collection
+    counts = await asyncio.gather(*(collections[name].estimated_document_count() for name in names))
     
-    return result
+    return [{"name": name, "document_count": count} for name, count in zip(names, counts)]
 
 @api_router.get("/admin/database/collection/{collection_name}")
 async def query_collection(
     collection_name: str,
     limit: int = 50,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Query documents from a specific collection"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    collections = await db.list_collection_names()
-    if collection_name not in collections:
+    collection = (await database_collections()).get(collection_name)
+    if collection is None:
         raise HTTPException(status_code=404, detail=f"Collection '{collection_name}' not found")
     
-    documents = await db[collection_name].find({}, {"_id": 0}).limit(limit).to_list(limit)
-    total = await db[collection_name].count_documents({})
+    documents = await collection.find({}, {"_id": 0}).limit(limit).to_list(limit)
+    total = await collection.count_documents({})
     
     return {
         "collection": collection_name,
@@ -1756,18 +2548,10 @@ async def query_collection(
     }
 
 @api_router.post("/admin/backup")
-async def create_backup(current_user: dict = Depends(get_current_user)):
+async def create_backup(current_user: dict = Depends(REQUIRE_ADMIN)):
     """Create full database backup"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    collections = [
-        "users", "jobs", "applications", "resumes", "referrals",
-        "notifications", "documents", "ats_pipelines", "bgv_requests",
-        "candidate_tracking", "invoices", "automation_rules"
-    ]
-    
-    backup_path = await backup_manager.create_full_backup(db, collections)
+    backup_path = await backup_manager.create_full_backup(db, BACKUP_COLLECTIONS)
+    _archive_names[BACKUP_DIR].add(Path(backup_path).name)
     
     return {
         "message": "Backup created successfully",
@@ -1776,33 +2560,27 @@ async def create_backup(current_user: dict = Depends(get_current_user)):
     }
 
 @api_router.get("/admin/backups")
-async def list_backups(current_user: dict = Depends(get_current_user)):
+async def list_backups(request: Request, current_user: dict = Depends(REQUIRE_ADMIN)):
     """List all backups"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    # Skip re-scanning the directory when nothing was added or removed
+    etag = directory_etag(backup_manager.backup_dir)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
     
     backups = backup_manager.list_backups()
-    return backups
+    return ORJSONResponse(backups, headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL, "Vary": "Authorization"})
 
 @api_router.get("/admin/backups/{filename}/download")
-async def download_backup(filename: str, current_user: dict = Depends(get_current_user)):
+async def download_backup(filename: str, request: Request, current_user: dict = Depends(REQUIRE_ADMIN)):
     """Download backup file"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    backup_path = os.path.join("/app/backups", filename)
-    if not os.path.exists(backup_path):
-        raise HTTPException(status_code=404, detail="Backup not found")
-    
-    return FileResponse(backup_path, filename=filename, media_type="application/zip")
+    backup_path = resolve_archive(BACKUP_DIR, filename, "Backup not found")
+    return file_download_response(request, str(backup_path), filename, "application/zip", not_found_detail="Backup not found")
 
 @api_router.post("/admin/export-code")
-async def export_code(current_user: dict = Depends(get_current_user)):
+async def export_code(current_user: dict = Depends(REQUIRE_ADMIN)):
     """Export complete codebase as ZIP"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     archive_path = code_exporter.create_code_archive()
+    _archive_names[EXPORT_DIR].add(Path(archive_path).name)
     
     return {
         "message": "Code exported successfully",
@@ -1811,25 +2589,20 @@ async def export_code(current_user: dict = Depends(get_current_user)):
     }
 
 @api_router.get("/admin/exports")
-async def list_exports(current_user: dict = Depends(get_current_user)):
+async def list_exports(request: Request, current_user: dict = Depends(REQUIRE_ADMIN)):
     """List all code exports"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    etag = directory_etag(code_exporter.export_dir)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
     
     exports = code_exporter.list_exports()
-    return exports
+    return ORJSONResponse(exports, headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL, "Vary": "Authorization"})
 
 @api_router.get("/admin/exports/{filename}/download")
-async def download_export(filename: str, current_user: dict = Depends(get_current_user)):
+async def download_export(filename: str, request: Request, current_user: dict = Depends(REQUIRE_ADMIN)):
     """Download code export"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    export_path = os.path.join("/app/exports", filename)
-    if not os.path.exists(export_path):
-        raise HTTPException(status_code=404, detail="Export not found")
-    
-    return FileResponse(export_path, filename=filename, media_type="application/zip")
+    export_path = resolve_archive(EXPORT_DIR, filename, "Export not found")
+    return file_download_response(request, str(export_path), filename, "application/zip", not_found_detail="Export not found")
 
 
 # ============= ENHANCED COMMISSION ENDPOINTS =============
@@ -1859,35 +2632,36 @@ async def get_commission_summary(current_user: dict = Depends(get_current_user))
     result = await commission_calculator.get_commission_summary(current_user["id"])
     return result
 
+# The rate tables are constants, so the response body is built once
+COMMISSION_RATES_JSON = orjson.dumps({
+    "package_rates": {
+        level.value: {
+            "rate": f"{rate * 100}%",
+            "package_range": {
+                "entry": "₹0-3L",
+                "junior": "₹3-6L",
+                "mid_level": "₹6-12L",
+                "senior": "₹12-20L",
+                "leadership": "₹20-35L",
+                "executive": "₹35L+"
+            }.get(level.value)
+        }
+        for level, rate in PACKAGE_COMMISSION_RATES.items()
+    },
+    "tier_multipliers": {
+        tier.value: multiplier
+        for tier, multiplier in USER_TIER_MULTIPLIERS.items()
+    },
+    "deductions": {
+        "tds": "10% (if commission > ₹30,000)",
+        "platform_fee": "5%"
+    }
+})
+
 @api_router.get("/commission/rates")
 async def get_commission_rates():
     """Get commission rate structure"""
-    from services.commission_service import PACKAGE_COMMISSION_RATES, USER_TIER_MULTIPLIERS, PackageLevel, UserTier
-    
-    return {
-        "package_rates": {
-            level.value: {
-                "rate": f"{rate * 100}%",
-                "package_range": {
-                    "entry": "₹0-3L",
-                    "junior": "₹3-6L",
-                    "mid_level": "₹6-12L",
-                    "senior": "₹12-20L",
-                    "leadership": "₹20-35L",
-                    "executive": "₹35L+"
-                }.get(level.value)
-            }
-            for level, rate in PACKAGE_COMMISSION_RATES.items()
-        },
-        "tier_multipliers": {
-            tier.value: multiplier
-            for tier, multiplier in USER_TIER_MULTIPLIERS.items()
-        },
-        "deductions": {
-            "tds": "10% (if commission > ₹30,000)",
-            "platform_fee": "5%"
-        }
-    }
+    return Response(content=COMMISSION_RATES_JSON, media_type="application/json")
 
 
 # ============= CANDIDATE MATCHING ENDPOINTS =============
@@ -1897,12 +2671,9 @@ async def find_matching_candidates(
     job_id: str,
     limit: int = 50,
     min_score: int = 0,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Find and rank matching candidates for a job"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     matches = await candidate_matcher.find_matching_candidates(
         job_id=job_id,
         limit=limit,
@@ -1918,19 +2689,25 @@ class MatchScoreRequest(BaseModel):
     candidate_id: str
     job_id: str
 
+# Only the resume fields the candidate profile is built from
+MATCH_RESUME_PROJECTION = {
+    "_id": 0, "candidate_id": 1, "skills": 1, "experience_years": 1, "education": 1,
+    "parsed_data.location": 1, "parsed_data.expected_salary": 1
+}
+
 @api_router.post("/matching/score")
 async def calculate_match_score(
     request: MatchScoreRequest,
     current_user: dict = Depends(get_current_user)
 ):
     """Calculate match score between candidate and job"""
-    # Get candidate resume
-    resume = await db.resumes.find_one({"candidate_id": request.candidate_id}, {"_id": 0})
+    # Independent lookups; overlap the round trips
+    resume, job = await asyncio.gather(
+        db.resumes.find_one({"candidate_id": request.candidate_id}, MATCH_RESUME_PROJECTION),
+        db.jobs.find_one({"id": request.job_id}, {"_id": 0})
+    )
     if not resume:
         raise HTTPException(status_code=404, detail="Candidate resume not found")
-    
-    # Get job
-    job = await db.jobs.find_one({"id": request.job_id}, {"_id": 0})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -1953,12 +2730,9 @@ async def calculate_match_score(
 @api_router.post("/applications/{application_id}/screen")
 async def screen_application(
     application_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Run automated screening on an application"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await application_pipeline.auto_screen_application(application_id)
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -1974,12 +2748,9 @@ class StatusUpdateRequest(BaseModel):
 async def update_application_status(
     application_id: str,
     request: StatusUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Update application status with validation"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await application_pipeline.update_status(
         application_id=application_id,
         new_status=request.new_status,
@@ -2019,12 +2790,9 @@ class InterviewScheduleRequest(BaseModel):
 async def schedule_interview(
     application_id: str,
     request: InterviewScheduleRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Schedule an interview for an application"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await application_pipeline.schedule_interview(
         application_id=application_id,
         interview_type=request.interview_type,
@@ -2054,12 +2822,9 @@ class InterviewFeedbackRequest(BaseModel):
 async def submit_interview_feedback(
     interview_id: str,
     request: InterviewFeedbackRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Submit feedback for a completed interview"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await application_pipeline.submit_interview_feedback(
         interview_id=interview_id,
         feedback_by=current_user["id"],
@@ -2079,12 +2844,9 @@ async def submit_interview_feedback(
 @api_router.get("/pipeline/stats")
 async def get_pipeline_stats(
     job_id: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Get application pipeline statistics"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await application_pipeline.get_pipeline_stats(job_id)
     return result
 
@@ -2102,12 +2864,9 @@ class BGVCreateRequest(BaseModel):
 @api_router.post("/bgv/requests")
 async def create_bgv_request(
     request: BGVCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Create a new BGV request"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await bgv_service.create_bgv_request(
         candidate_id=request.candidate_id,
         application_id=request.application_id,
@@ -2125,6 +2884,7 @@ async def create_bgv_request(
 
 @api_router.get("/bgv/requests")
 async def list_bgv_requests(
+    request: Request,
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
@@ -2142,7 +2902,7 @@ async def list_bgv_requests(
         raise HTTPException(status_code=403, detail="Access denied")
     
     requests = await db.bgv_requests.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
-    return {"total": len(requests), "requests": requests}
+    return etag_json_response(request, {"total": len(requests), "requests": requests})
 
 @api_router.get("/bgv/requests/{bgv_id}")
 async def get_bgv_request(
@@ -2164,12 +2924,9 @@ class BGVAssignRequest(BaseModel):
 async def assign_bgv_specialist(
     bgv_id: str,
     request: BGVAssignRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Assign a specialist to a BGV check"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     result = await bgv_service.assign_specialist(
         bgv_id=bgv_id,
         check_type=request.check_type,
@@ -2192,12 +2949,9 @@ class BGVCheckUpdateRequest(BaseModel):
 async def update_bgv_check(
     bgv_id: str,
     request: BGVCheckUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_BGV_SPECIALIST)
 ):
     """Update a BGV check status"""
-    if current_user["role"] not in ["admin", "bgv_specialist"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await bgv_service.update_check_status(
         bgv_id=bgv_id,
         check_type=request.check_type,
@@ -2222,12 +2976,9 @@ class BGVCompleteRequest(BaseModel):
 async def complete_bgv_verification(
     bgv_id: str,
     request: BGVCompleteRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_BGV_SPECIALIST)
 ):
     """Complete BGV verification"""
-    if current_user["role"] not in ["admin", "bgv_specialist"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await bgv_service.complete_verification(
         bgv_id=bgv_id,
         specialist_id=current_user["id"],
@@ -2242,11 +2993,8 @@ async def complete_bgv_verification(
     return result
 
 @api_router.get("/bgv/specialist/workload")
-async def get_specialist_workload(current_user: dict = Depends(get_current_user)):
+async def get_specialist_workload(current_user: dict = Depends(REQUIRE_BGV_SPECIALIST)):
     """Get workload for BGV specialist"""
-    if current_user["role"] not in ["admin", "bgv_specialist"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     specialist_id = current_user["id"]
     result = await bgv_service.get_specialist_workload(specialist_id)
     return result
@@ -2272,24 +3020,18 @@ async def get_resource_audit_log(
     resource_type: str,
     resource_id: str,
     limit: int = 100,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Get audit log for a specific resource"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     logs = await audit_logger.get_resource_history(resource_type, resource_id, limit)
     return {"resource_type": resource_type, "resource_id": resource_id, "logs": logs}
 
 @api_router.get("/audit/security")
 async def get_security_events(
     hours: int = 24,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Get security-related audit events"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     since = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
     logs = await audit_logger.get_security_events(since)
     return {"events": logs, "period_hours": hours}
@@ -2298,12 +3040,9 @@ async def get_security_events(
 async def get_failed_logins(
     hours: int = 24,
     min_attempts: int = 3,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Get failed login attempts"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     results = await audit_logger.get_failed_logins(hours, min_attempts)
     return {"suspicious_accounts": results}
 
@@ -2314,12 +3053,9 @@ class ComplianceReportRequest(BaseModel):
 @api_router.post("/audit/compliance-report")
 async def generate_compliance_report(
     request: ComplianceReportRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ADMIN)
 ):
     """Generate compliance report"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     report = await audit_logger.generate_compliance_report(
         start_date=request.start_date,
         end_date=request.end_date
@@ -2340,14 +3076,10 @@ async def get_notifications(
     if unread_only:
         query["read"] = False
     
-    notifications = await db.notifications.find(
-        query, {"_id": 0}
-    ).sort("created_at", -1).limit(limit).to_list(limit)
-    
-    unread_count = await db.notifications.count_documents({
-        "user_id": current_user["id"],
-        "read": False
-    })
+    notifications, unread_count = await asyncio.gather(
+        db.notifications.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit),
+        db.notifications.count_documents({"user_id": current_user["id"], "read": False})
+    )
     
     return {
         "notifications": notifications,
@@ -2425,7 +3157,8 @@ async def update_user_profile(
 ):
     """Update user profile"""
     update_data = {k: v for k, v in request.dict().items() if v is not None}
-    update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    now_iso = datetime.now(timezone.utc).isoformat()
+    update_data["updated_at"] = now_iso
     
     # Calculate profile completion
     profile_fields = ["first_name", "last_name", "phone", "skills", "bio"]
@@ -2441,11 +3174,12 @@ async def update_user_profile(
             "$set": update_data,
             "$setOnInsert": {
                 "user_id": current_user["id"],
-                "created_at": datetime.now(timezone.utc).isoformat()
+                "created_at": now_iso
             }
         },
         upsert=True
     )
+    invalidate_cached_user(current_user["id"])
     
     return {
         "status": "updated",
@@ -2463,48 +3197,64 @@ async def track_job_view(
 ):
     """Track job view for analytics"""
     view = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "job_id": job_id,
         "viewer_id": current_user["id"] if current_user else None,
         "viewer_ip": request.client.host if request.client else None,
         "source": request.headers.get("referer", "direct"),
-        "viewed_at": datetime.now(timezone.utc).isoformat()
+        # BSON Date so analytics can bucket by day with $dateTrunc
+        "viewed_at": datetime.now(timezone.utc)
     }
     
-    await db.job_views.insert_one(view)
+    await bulk_writers["job_views"].insert(view)
     return {"tracked": True}
 
+# View counts are allowed to lag by up to a minute
+_job_analytics_cache = LRUTTLCache(max_size=1000, ttl_seconds=60)
+
 @api_router.get("/jobs/{job_id}/analytics")
 async def get_job_analytics(
     job_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_HIRING_TEAM)
 ):
     """Get job view analytics"""
-    if current_user["role"] not in ["admin", "company", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    # Total views
-    total_views = await db.job_views.count_documents({"job_id": job_id})
-    
-    # Unique viewers
-    unique_viewers = len(await db.job_views.distinct("viewer_id", {"job_id": job_id}))
-    
-    # Views by day (last 30 days)
-    thirty_days_ago = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    hit = _job_analytics_cache.get(job_id)
+    if hit is not None:
+        return hit
+    
+    # Views by day cover the last 30 days; views recorded before viewed_at
+    # became a BSON Date hold ISO strings, which sort the same way and
+    # $toDate parses
+    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
     pipeline = [
-        {"$match": {"job_id": job_id, "viewed_at": {"$gte": thirty_days_ago}}},
-        {"$group": {
-            "_id": {"$substr": ["$viewed_at", 0, 10]},
-            "count": {"$sum": 1}
-        }},
-        {"$sort": {"_id": 1}}
+        {"$match": {"job_id": job_id}},
+        # Totals, unique viewers and the daily series in one pass
+        {"$facet": {
+            "total": [{"$count": "n"}],
+            "unique": [{"$group": {"_id": "$viewer_id"}}, {"$count": "n"}],
+            "by_day": [
+                {"$match": {"$or": [
+                    {"viewed_at": {"$gte": cutoff}},
+                    {"viewed_at": {"$gte": cutoff.isoformat()}}
+                ]}},
+                {"$group": {
+                    "_id": {"$dateTrunc": {"date": {"$toDate": "$viewed_at"}, "unit": "day"}},
+                    "count": {"$sum": 1}
+                }},
+                {"$sort": {"_id": 1}},
+                {"$project": {"_id": {"$dateToString": {"date": "$_id", "format": "%Y-%m-%d"}}, "count": 1}}
+            ]
+        }}
     ]
-    views_by_day = await db.job_views.aggregate(pipeline).to_list(30)
-    
-    # Applications count
-    applications = await db.applications.count_documents({"job_id": job_id})
+    (facets,), applications = await asyncio.gather(
+        db.job_views.aggregate(pipeline).to_list(1),
+        db.applications.count_documents({"job_id": job_id})
+    )
+    total_views = facets["total"][0]["n"] if facets["total"] else 0
+    unique_viewers = facets["unique"][0]["n"] if facets["unique"] else 0
+    views_by_day = facets["by_day"]
     
-    return {
+    analytics = {
         "job_id": job_id,
         "total_views": total_views,
         "unique_viewers": unique_viewers,
@@ -2512,6 +3262,8 @@ async def get_job_analytics(
         "conversion_rate": f"{(applications / total_views * 100) if total_views > 0 else 0:.1f}%",
         "views_by_day": views_by_day
     }
+    _job_analytics_cache.set(job_id, analytics)
+    return analytics
 
 # ============= WHATSAPP NOTIFICATIONS (MOCKED) =============
 
@@ -2532,24 +3284,18 @@ async def get_whatsapp_status(current_user: dict = Depends(get_current_user)):
 @api_router.post("/whatsapp/send")
 async def send_whatsapp_message(
     request: WhatsAppMessageRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_RECRUITER_OR_ADMIN)
 ):
     """Send a WhatsApp message (mocked)"""
-    if current_user["role"] not in ["admin", "super_admin", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await whatsapp_service.send_message(request.to_number, request.message)
     return result
 
 @api_router.post("/whatsapp/notify")
 async def send_whatsapp_notification(
     request: WhatsAppNotificationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_RECRUITER_OR_ADMIN)
 ):
     """Send a templated WhatsApp notification (mocked)"""
-    if current_user["role"] not in ["admin", "super_admin", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     try:
         notification_type = NotificationType(request.notification_type)
     except ValueError:
@@ -2565,12 +3311,9 @@ async def send_whatsapp_notification(
 @api_router.get("/whatsapp/log")
 async def get_whatsapp_log(
     limit: int = 50,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ANY_ADMIN)
 ):
     """Get WhatsApp message log (mocked mode only)"""
-    if current_user["role"] not in ["admin", "super_admin"]:
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     return {
         "messages": whatsapp_service.get_message_log(limit),
         "service_status": whatsapp_service.get_service_status()
@@ -2598,12 +3341,9 @@ class JDImproveRequest(BaseModel):
 @api_router.post("/ai/generate-jd")
 async def generate_job_description(
     request: JDGenerateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_JD_AUTHOR)
 ):
     """Generate a professional job description using AI"""
-    if current_user["role"] not in ["admin", "super_admin", "recruiter", "client"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await jd_generator.generate_jd(
         job_title=request.job_title,
         company_name=request.company_name,
@@ -2632,12 +3372,9 @@ async def generate_job_description(
 @api_router.post("/ai/improve-jd")
 async def improve_job_description(
     request: JDImproveRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_JD_AUTHOR)
 ):
     """Improve an existing job description using AI"""
-    if current_user["role"] not in ["admin", "super_admin", "recruiter", "client"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     result = await jd_generator.improve_jd(
         existing_jd=request.existing_jd,
         improvement_focus=request.improvement_focus
@@ -2647,22 +3384,16 @@ async def improve_job_description(
 # ============= CACHE MANAGEMENT =============
 
 @api_router.get("/cache/stats")
-async def get_cache_stats(current_user: dict = Depends(get_current_user)):
+async def get_cache_stats(current_user: dict = Depends(REQUIRE_ANY_ADMIN)):
     """Get cache statistics"""
-    if current_user["role"] not in ["admin", "super_admin"]:
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    return cache_manager.get_stats()
+    return {**cache_manager.get_stats(), "llm": llm_cache.get_stats()}
 
 @api_router.post("/cache/clear")
 async def clear_cache(
     prefix: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(REQUIRE_ANY_ADMIN)
 ):
     """Clear cache (all or by prefix)"""
-    if current_user["role"] not in ["admin", "super_admin"]:
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     if prefix:
         count = await cache_manager.cache.clear(prefix)
         return {"cleared": count, "prefix": prefix}
@@ -2671,11 +3402,8 @@ async def clear_cache(
     return result
 
 @api_router.post("/cache/invalidate/jobs")
-async def invalidate_jobs_cache(current_user: dict = Depends(get_current_user)):
+async def invalidate_jobs_cache(current_user: dict = Depends(REQUIRE_RECRUITER_OR_ADMIN)):
     """Invalidate job listings cache"""
-    if current_user["role"] not in ["admin", "super_admin", "recruiter"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     count = await cache_manager.invalidate_jobs()
     return {"invalidated": count, "type": "jobs"}
 
@@ -2715,9 +3443,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (parsed resumes, stage histories, lists);
+# file downloads and ranged responses are left alone
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024)
+
+# Records don't collect thread/process info nobody reads
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format=os.environ.get('LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
 logger = logging.getLogger(__name__)
 
@@ -2727,7 +3463,43 @@ async def startup_event():
     # Initialize gamification system
     await gamification_service.initialize()
     logger.info("Gamification system initialized")
+    
+    await ensure_indexes()
+    logger.info("Database indexes ensured")
+    
+    try:
+        await backfill_job_application_counts()
+    except Exception as e:
+        logger.warning("applications_count backfill failed: %s", e)
+    
+    try:
+        await backfill_application_company_ids()
+    except Exception as e:
+        logger.warning("applications company_id backfill failed: %s", e)
+    
+    for directory in (BACKUP_DIR, EXPORT_DIR):
+        refresh_archive_names(directory)
+    
+    # LLM response cache lookup + TTL indexes
+    try:
+        await llm_cache.ensure_indexes()
+    except Exception as e:
+        logger.warning("LLM cache index setup failed: %s", e)
+    
+    global _fx_refresh_task
+    if FX_RATES_URL:
+        _fx_refresh_task = asyncio.create_task(
+            fx_rates.run(FX_RATES_URL, FX_RATES_REFRESH_SECONDS)
+        )
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    if _fx_refresh_task is not None:
+        _fx_refresh_task.cancel()
+    await email_service.close()
+    await bulk_writers.close()
+    await auth_http_client.aclose()
+    client.close()
+    _extract_pool.shutdown(wait=False, cancel_futures=True)
+    _pdf_pool.shutdown(wait=False, cancel_futures=True)
+    _hash_pool.shutdown(wait=False, cancel_futures=True)
@@ -12,7 +12,7 @@ Comprehensive audit logging for:
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 from enum import Enum
-import uuid
+from utils.ids import new_id
 import logging
 
 logger = logging.getLogger(__name__)
@@ -104,7 +104,7 @@ class AuditLogger:
         Returns:
             Audit log entry ID
         """
-        log_id = str(uuid.uuid4())
+        log_id = new_id()
         
         # Sanitize sensitive data
         if old_value:
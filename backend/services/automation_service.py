@@ -0,0 +1,199 @@
+"""
+Automation Service
+HiringReferrals Platform
+
+Runs automation rules against platform events:
+- Rules are compiled once (templates parsed, handlers resolved) into a
+  trigger -> rules dispatch table, so firing is a dict lookup plus direct calls
+- Notification fan-out buffered and inserted with one unordered insert_many
+- run_count / last_run of every rule that fired in the same tick sent as
+  one unordered bulk_write
+
+Supported actions:
+    {"type": "notify", "target": "candidate_id", "title": "...", "message": "Now $status"}
+target names the event field holding the recipient (or pass a fixed user_id);
+title/message are string.Template patterns filled from the event fields.
+"""
+
+from typing import Dict, Any, List, Callable, Optional, Tuple
+from datetime import datetime, timezone
+from collections import Counter
+from string import Template
+from pymongo import UpdateOne
+from utils.ids import new_id
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AutomationBatch:
+    """
+    Writes collected while firing rules; flushed by AutomationService.flush
+    """
+
+    def __init__(self):
+        self.notifications: List[Dict[str, Any]] = []
+        self.fired_rules: Counter = Counter()
+
+    def notify(self, user_id: str, title: str, message: str, type: str = "info"):
+        """Queue a notification instead of inserting it immediately"""
+        self.notifications.append({
+            "id": new_id(),
+            "user_id": user_id,
+            "title": title,
+            "message": message,
+            "type": type,
+            "read": False,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+
+    def rule_fired(self, rule_id: str):
+        """Count one execution of a rule"""
+        self.fired_rules[rule_id] += 1
+
+
+ActionHandler = Callable[[Dict[str, Any], AutomationBatch], None]
+
+
+def _compile_notify(action: Dict[str, Any]) -> ActionHandler:
+    title = Template(action.get("title", "Notification"))
+    message = Template(action.get("message", ""))
+    notification_type = action.get("notification_type", "info")
+    fixed_user_id = action.get("user_id")
+    target = action.get("target", "user_id")
+
+    def run(event: Dict[str, Any], batch: AutomationBatch):
+        recipient = fixed_user_id or event.get(target)
+        if recipient:
+            batch.notify(recipient, title.safe_substitute(event), message.safe_substitute(event), notification_type)
+
+    return run
+
+
+ACTION_COMPILERS: Dict[str, Callable[[Dict[str, Any]], ActionHandler]] = {
+    "notify": _compile_notify,
+    "send_notification": _compile_notify,
+}
+
+
+class CompiledRule:
+    """A rule with its conditions and action handlers resolved up front"""
+
+    __slots__ = ("rule_id", "conditions", "handlers")
+
+    def __init__(self, rule_id: str, conditions: Tuple[Tuple[str, Any], ...], handlers: Tuple[ActionHandler, ...]):
+        self.rule_id = rule_id
+        self.conditions = conditions
+        self.handlers = handlers
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return all(event.get(field) == expected for field, expected in self.conditions)
+
+    def run(self, event: Dict[str, Any], batch: AutomationBatch):
+        for handler in self.handlers:
+            handler(event, batch)
+
+
+class AutomationService:
+    """
+    Dispatches events to compiled rules and flushes their side effects
+    with one round trip per collection
+    """
+
+    def __init__(self, db, refresh_seconds: Optional[int] = None):
+        self.db = db
+        self.active_rules: Dict[str, List[CompiledRule]] = {}
+        # Rules created on other workers are picked up on the next refresh
+        self.refresh_seconds = refresh_seconds or int(os.environ.get("AUTOMATION_RULES_REFRESH_SECONDS", "60"))
+        self._loaded_at: Optional[float] = None
+
+    @staticmethod
+    def trigger_key(rule: Dict[str, Any]) -> str:
+        """Event-based rules dispatch on their event name, others on trigger_type"""
+        return (rule.get("trigger_config") or {}).get("event") or rule["trigger_type"]
+
+    @staticmethod
+    def compile(rule: Dict[str, Any]) -> CompiledRule:
+        """Resolve a rule's conditions and actions once"""
+        conditions = tuple(
+            (field, expected)
+            for field, expected in (rule.get("trigger_config") or {}).items()
+            if field != "event"
+        )
+        handlers = []
+        for action in rule.get("actions", []):
+            compiler = ACTION_COMPILERS.get(action.get("type"))
+            if compiler is None:
+                logger.warning(f"Automation rule {rule['id']}: unsupported action {action.get('type')!r}")
+                continue
+            handlers.append(compiler(action))
+        return CompiledRule(rule["id"], conditions, tuple(handlers))
+
+    def register(self, rule: Dict[str, Any]):
+        """Add a newly created rule to the dispatch table"""
+        if rule.get("is_active", True):
+            self.active_rules.setdefault(self.trigger_key(rule), []).append(self.compile(rule))
+
+    async def load_rules(self):
+        """Rebuild the dispatch table from the active rules in MongoDB"""
+        rules = await self.db.automation_rules.find(
+            {"is_active": True},
+            {"_id": 0, "id": 1, "trigger_type": 1, "trigger_config": 1, "actions": 1}
+        ).to_list(None)
+
+        active_rules: Dict[str, List[CompiledRule]] = {}
+        for rule in rules:
+            active_rules.setdefault(self.trigger_key(rule), []).append(self.compile(rule))
+        self.active_rules = active_rules
+        self._loaded_at = time.monotonic()
+
+    async def fire(self, event_name: str, event: Dict[str, Any]) -> Dict[str, int]:
+        """Run every active rule listening for event_name"""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            await self.load_rules()
+
+        rules = self.active_rules.get(event_name)
+        if not rules:
+            return {"notifications": 0, "rules": 0}
+
+        batch = self.new_batch()
+        for rule in rules:
+            if rule.matches(event):
+                rule.run(event, batch)
+                batch.rule_fired(rule.rule_id)
+        return await self.flush(batch)
+
+    def new_batch(self) -> AutomationBatch:
+        return AutomationBatch()
+
+    async def flush(self, batch: AutomationBatch) -> Dict[str, int]:
+        """Write out queued notifications and rule counters"""
+        notified = 0
+        if batch.notifications:
+            result = await self.db.notifications.insert_many(batch.notifications, ordered=False)
+            notified = len(result.inserted_ids)
+
+        updated = 0
+        if batch.fired_rules:
+            now = datetime.now(timezone.utc).isoformat()
+            result = await self.db.automation_rules.bulk_write(
+                [
+                    UpdateOne({"id": rule_id}, {"$inc": {"run_count": runs}, "$set": {"last_run": now}})
+                    for rule_id, runs in batch.fired_rules.items()
+                ],
+                ordered=False
+            )
+            updated = result.modified_count
+
+        if notified or updated:
+            logger.info(f"Automation batch flushed: {notified} notifications, {updated} rules")
+
+        batch.notifications.clear()
+        batch.fired_rules.clear()
+        return {"notifications": notified, "rules": updated}
+
+
+def create_automation_service(db) -> AutomationService:
+    return AutomationService(db)
@@ -12,7 +12,8 @@ Comprehensive BGV workflow:
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 from enum import Enum
-import uuid
+from utils.ids import new_id
+from services.cache_service import cache_manager, CacheKeys
 import logging
 
 logger = logging.getLogger(__name__)
@@ -116,13 +117,13 @@ class BGVService:
         estimated_days = int(max_tat * priority_multiplier.get(priority, 1.0))
         estimated_completion = (datetime.now(timezone.utc) + timedelta(days=estimated_days)).isoformat()
         
-        bgv_id = str(uuid.uuid4())
+        bgv_id = new_id()
         
         # Create individual checks
         checks = []
         for vtype in verification_types:
             check = {
-                "check_id": str(uuid.uuid4()),
+                "check_id": new_id(),
                 "check_type": vtype,
                 "status": BGVStatus.PENDING.value,
                 "assigned_to": None,
@@ -159,6 +160,7 @@ class BGVService:
         }
         
         await self.db.bgv_requests.insert_one(bgv_request)
+        cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
         
         # Create notification for candidate
         await self._create_notification(
@@ -200,6 +202,7 @@ class BGVService:
                 }
             }
         )
+        cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
         
         if result.modified_count == 0:
             return {"error": "BGV request or check not found"}
@@ -247,6 +250,7 @@ class BGVService:
             {"id": bgv_id, "checks.check_type": check_type},
             {"$set": update_data}
         )
+        cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
         
         if result.modified_count == 0:
             return {"error": "BGV request or check not found"}
@@ -279,6 +283,7 @@ class BGVService:
                 }
             }
         )
+        cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
         
         if result.modified_count == 0:
             return {"error": "BGV request or check not found"}
@@ -332,6 +337,7 @@ class BGVService:
                 }
             }
         )
+        cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
         
         # Notify stakeholders
         await self._notify_bgv_completion(bgv_request, overall_result)
@@ -376,6 +382,7 @@ class BGVService:
             {"id": bgv_id},
             {"$set": {"completion_percentage": percentage, "status": status}}
         )
+        cache_manager.invalidate_list(CacheKeys.BGV_REQUESTS)
     
     async def _generate_bgv_report(
         self,
@@ -386,7 +393,7 @@ class BGVService:
     ) -> Dict[str, Any]:
         """Generate BGV report document"""
         
-        report_id = str(uuid.uuid4())
+        report_id = new_id()
         report_path = f"/app/bgv_reports/{report_id}.json"
         
         report = {
@@ -441,7 +448,7 @@ class BGVService:
     ):
         """Create notification"""
         notification = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "user_id": user_id,
             "title": title,
             "message": message,
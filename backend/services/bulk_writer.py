@@ -0,0 +1,135 @@
+"""
+Bulk Writer
+HiringReferrals Platform
+
+Coalesces single-document inserts into unordered bulk writes:
+- An insert arriving at an idle writer is written at once; inserts that
+  pile up behind it (within BATCH_WINDOW, up to BATCH_SIZE) go out as
+  one bulk_write per collection
+- Each caller still awaits its own insert and gets its own error, so a
+  duplicate key fails only the document that caused it
+- One writer per collection, created on first use
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Queued by close(); the worker writes what came before it and exits
+_STOP = object()
+
+
+def _write_error(error: Dict[str, Any]) -> WriteError:
+    """Rebuild the per-document exception insert_one would have raised"""
+    cls = DuplicateKeyError if error.get("code") == 11000 else WriteError
+    return cls(error.get("errmsg"), error.get("code"), error)
+
+
+class BulkWriter:
+    """
+    Batches inserts for one collection; insert() returns once the batch
+    holding the document has been written
+    """
+
+    BATCH_SIZE = 500
+    BATCH_WINDOW = 0.005
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def insert(self, document: Dict[str, Any]) -> None:
+        """Insert one document as part of the next bulk write"""
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((document, future))
+        await future
+
+    async def _next_batch(self) -> Tuple[List[Tuple[Dict[str, Any], asyncio.Future]], bool]:
+        """The next batch to write, and whether close() asked the worker to stop"""
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        # A lone insert is not held back waiting for company
+        if self._queue.empty():
+            return batch, False
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.BATCH_WINDOW
+        while len(batch) < self.BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _write(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        failed: Dict[int, Exception] = {}
+        try:
+            await self.collection.bulk_write([InsertOne(doc) for doc, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: _write_error(error) for error in e.details.get("writeErrors", [])}
+        except Exception as e:
+            logger.error("Bulk insert of %d documents into %s failed: %s", len(batch), self.collection.name, e)
+            failed = dict.fromkeys(range(len(batch)), e)
+
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result(None)
+
+    async def _run(self):
+        while True:
+            batch, stop = await self._next_batch()
+            if batch:
+                await self._write(batch)
+            if stop:
+                return
+
+    async def close(self):
+        """Stop the worker once everything queued so far has been written"""
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            self._queue.put_nowait(_STOP)
+            await self._worker
+        self._worker = None
+
+
+class BulkWriters:
+    """Per-collection BulkWriters for one database"""
+
+    def __init__(self, db):
+        self.db = db
+        self._writers: Dict[str, BulkWriter] = {}
+
+    def __getitem__(self, collection_name: str) -> BulkWriter:
+        writer = self._writers.get(collection_name)
+        if writer is None:
+            writer = self._writers[collection_name] = BulkWriter(self.db[collection_name])
+        return writer
+
+    async def close(self):
+        for writer in self._writers.values():
+            await writer.close()
+
+
+def create_bulk_writers(db) -> BulkWriters:
+    return BulkWriters(db)
@@ -7,8 +7,9 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, Callable, TypeVar, Generic
 from functools import wraps
+from collections import OrderedDict
 import hashlib
-import json
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -141,6 +142,53 @@ class InMemoryCache:
         }
 
 
+class LRUTTLCache:
+    """
+    Lock-free LRU cache with per-entry expiry for synchronous hot paths.
+    Safe on the event loop because no method awaits.
+    """
+    
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300):
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Set a value; ttl overrides the default and is capped by it."""
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        if ttl <= 0:
+            return
+        
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        if len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+    
+    def delete(self, key: str) -> bool:
+        """Delete a key."""
+        return self._data.pop(key, None) is not None
+    
+    def clear(self) -> int:
+        """Remove every entry."""
+        count = len(self._data)
+        self._data.clear()
+        return count
+
+
 # Global cache instance
 cache = InMemoryCache(max_size=2000)
 
@@ -158,6 +206,9 @@ class CacheKeys:
     USER_STATS = "user_stats"
     COMMISSION_RATES = "commission_rates"
     ACHIEVEMENTS = "achievements"
+    BGV_REQUESTS = "bgv_requests"
+    TRACKING = "tracking"
+    INVOICES = "invoices"
 
 
 def cached(prefix: str, ttl: int = InMemoryCache.TTL_MEDIUM):
@@ -204,8 +255,12 @@ class CacheManager:
     High-level cache management interface.
     """
     
+    # Polled list responses; short enough to bound staleness across workers
+    LIST_TTL = 10
+    
     def __init__(self):
         self.cache = cache
+        self._list_generations: Dict[str, int] = {}
     
     # ============= JOB CACHING =============
     
@@ -244,15 +299,21 @@ class CacheManager:
     
     # ============= LEADERBOARD CACHING =============
     
-    async def get_leaderboard(self, period: str = "all") -> Optional[list]:
+    def _leaderboard_key(self, period: str, limit: Optional[int]) -> str:
+        generation = self._list_generations.get(CacheKeys.LEADERBOARD, 0)
+        return cache._generate_key(CacheKeys.LEADERBOARD, generation, period=period, limit=limit)
+    
+    async def get_leaderboard(self, period: str = "all", limit: Optional[int] = None) -> Optional[Any]:
         """Get cached leaderboard."""
-        key = cache._generate_key(CacheKeys.LEADERBOARD, period=period)
-        return await cache.get(key)
+        return await cache.get(self._leaderboard_key(period, limit))
     
-    async def set_leaderboard(self, data: list, period: str = "all") -> None:
+    async def set_leaderboard(self, data: Any, period: str = "all", limit: Optional[int] = None) -> None:
         """Cache leaderboard data."""
-        key = cache._generate_key(CacheKeys.LEADERBOARD, period=period)
-        await cache.set(key, data, InMemoryCache.TTL_MEDIUM)
+        await cache.set(self._leaderboard_key(period, limit), data, InMemoryCache.TTL_SHORT)
+    
+    def invalidate_leaderboard(self) -> None:
+        """Orphan every cached leaderboard (they age out via TTL)."""
+        self.invalidate_list(CacheKeys.LEADERBOARD)
     
     # ============= ACHIEVEMENTS CACHING =============
     
@@ -274,6 +335,25 @@ class CacheManager:
         """Cache commission rates."""
         await cache.set(CacheKeys.COMMISSION_RATES, rates, InMemoryCache.TTL_VERY_LONG)
     
+    # ============= LIST RESPONSE CACHING =============
+    
+    def _list_key(self, prefix: str, user_id: str, role: str, params: Dict) -> str:
+        # Keys are hashed, so invalidation bumps a generation baked into the key
+        generation = self._list_generations.get(prefix, 0)
+        return cache._generate_key(prefix, generation, user_id=user_id, role=role, params=params)
+    
+    async def get_list(self, prefix: str, user_id: str, role: str, **params) -> Optional[Any]:
+        """Get a cached list response for one user and query."""
+        return await cache.get(self._list_key(prefix, user_id, role, params))
+    
+    async def set_list(self, prefix: str, user_id: str, role: str, value: Any, **params) -> None:
+        """Cache a list response for one user and query."""
+        await cache.set(self._list_key(prefix, user_id, role, params), value, self.LIST_TTL)
+    
+    def invalidate_list(self, prefix: str) -> None:
+        """Orphan every cached list under prefix (they age out via TTL)."""
+        self._list_generations[prefix] = self._list_generations.get(prefix, 0) + 1
+    
     # ============= STATS =============
     
     def get_stats(self) -> Dict[str, Any]:
@@ -12,6 +12,7 @@ Multi-tier commission rates based on:
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 from enum import Enum
+from services.fx_rates import fx_rates
 import logging
 
 logger = logging.getLogger(__name__)
@@ -172,7 +173,7 @@ class CommissionCalculator:
         # Currency conversion if needed
         exchange_rate = 1.0
         if currency == "USD":
-            exchange_rate = 0.012  # 1 INR = 0.012 USD
+            exchange_rate = float(fx_rates.get("USD"))
         
         result = {
             "user_id": user_id,
@@ -0,0 +1,99 @@
+"""
+FX Rates
+HiringReferrals Platform
+
+Process-wide INR-based exchange rates shared by invoicing, commissions
+and the currency-rates endpoint:
+- Rates held as Decimal so money is converted without float drift
+- Optional background refresh from an FX API (FX_RATES_URL)
+- Falls back to the built-in rates when no API is configured or a
+  refresh fails
+"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+import asyncio
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 1 INR = 0.012 USD until a live rate is fetched
+DEFAULT_RATES: Dict[str, Decimal] = {
+    "INR": Decimal("1"),
+    "USD": Decimal("0.012"),
+}
+
+CENT = Decimal("0.01")
+
+
+def to_money(value) -> Decimal:
+    """Round an amount to two decimal places, half up"""
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class FXRates:
+    """
+    Latest INR -> currency rates; replaced wholesale on refresh so readers
+    never see a half-updated table
+    """
+
+    base = "INR"
+
+    def __init__(self, rates: Optional[Dict[str, Decimal]] = None):
+        self._rates = dict(rates or DEFAULT_RATES)
+        self.updated_at = datetime.now(timezone.utc)
+
+    def supports(self, currency: str) -> bool:
+        return currency in self._rates
+
+    def get(self, currency: str) -> Decimal:
+        """Rate for converting INR to currency"""
+        try:
+            return self._rates[currency]
+        except KeyError:
+            raise ValueError(f"Unsupported currency: {currency}")
+
+    def convert(self, amount, currency: str) -> Decimal:
+        """Convert an INR amount to currency, rounded to the cent"""
+        return to_money(Decimal(str(amount)) * self.get(currency))
+
+    def update(self, rates: Dict[str, Any]):
+        """Replace the known rates with fresh ones (INR stays 1)"""
+        fresh = dict(self._rates)
+        for currency in self._rates:
+            if currency in rates:
+                fresh[currency] = Decimal(str(rates[currency]))
+        fresh[self.base] = Decimal("1")
+        self._rates = fresh
+        self.updated_at = datetime.now(timezone.utc)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-ready view of the current rates"""
+        return {
+            "base": self.base,
+            "rates": {currency: float(rate) for currency, rate in self._rates.items()},
+            "updated_at": self.updated_at.isoformat()
+        }
+
+    async def refresh(self, http_client, url: str):
+        """Fetch {"rates": {...}} with INR as the base from url"""
+        response = await http_client.get(url)
+        response.raise_for_status()
+        self.update(response.json()["rates"])
+
+    async def run(self, url: str, interval: float):
+        """Refresh forever; keeps the last good rates when a fetch fails"""
+        # Own client: a third-party API should not share the auth client's pool
+        async with httpx.AsyncClient(timeout=10.0) as http_client:
+            while True:
+                try:
+                    await self.refresh(http_client, url)
+                except Exception as e:
+                    logger.warning("FX rates refresh failed: %s", e)
+                await asyncio.sleep(interval)
+
+
+fx_rates = FXRates()
@@ -0,0 +1,109 @@
+"""
+LLM Response Cache Service
+HiringReferrals Platform
+
+Caches GPT-4o responses for resume parsing and scoring so repeated
+uploads / re-applications skip the LLM round-trip:
+- Exact-match lookup keyed by SHA-256 of the normalized prompt
+- Normalization collapses whitespace so re-uploads of the same resume
+  that differ only in spacing or line breaks share a cache entry
+- Entries expire via a MongoDB TTL index
+"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+import hashlib
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default entry lifetime (7 days)
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class LLMResponseCache:
+    """
+    MongoDB-backed cache for structured (JSON) LLM responses
+    """
+
+    def __init__(self, db, collection_name: str = "resume_ai_cache", ttl_seconds: Optional[int] = None):
+        self.db = db
+        self.collection = db[collection_name]
+        self.ttl_seconds = ttl_seconds or int(os.environ.get("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        self.enabled = os.environ.get("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self._stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so prompts differing only in spacing hash the same"""
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    @classmethod
+    def prompt_key(cls, system_message: str, prompt: str) -> str:
+        """Build the cache key for a (system message, prompt) pair"""
+        payload = f"{cls.normalize(system_message)}\n{cls.normalize(prompt)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a prompt key, if any"""
+        if not self.enabled:
+            return None
+
+        try:
+            entry = await self.collection.find_one(
+                {"prompt_sha256": key},
+                {"_id": 0, "response_json": 1}
+            )
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["hits"] += 1
+        return entry["response_json"]
+
+    async def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a parsed LLM response under a prompt key"""
+        if not self.enabled:
+            return
+
+        try:
+            await self.collection.update_one(
+                {"prompt_sha256": key},
+                {"$set": {
+                    "prompt_sha256": key,
+                    "response_json": response,
+                    "created_at": datetime.now(timezone.utc)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def ensure_indexes(self) -> None:
+        """Create the lookup and TTL indexes"""
+        await self.collection.create_index("prompt_sha256", unique=True)
+        await self.collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        total = self._stats["hits"] + self._stats["misses"]
+        hit_rate = (self._stats["hits"] / total * 100) if total > 0 else 0
+
+        return {
+            "enabled": self.enabled,
+            "hits": self._stats["hits"],
+            "misses": self._stats["misses"],
+            "hit_rate": f"{hit_rate:.1f}%"
+        }
+
+
+def create_llm_cache(db) -> LLMResponseCache:
+    return LLMResponseCache(db)
@@ -0,0 +1,97 @@
+"""
+LLM Rate Limiter
+HiringReferrals Platform
+
+Process-wide limiter shared by every GPT-4o call:
+- Concurrency cap (in-flight requests)
+- Token bucket tied to the provider's requests-per-minute quota
+- Exponential backoff with jitter on provider rate-limit errors
+- Fails fast with LLMCapacityError when a slot cannot be obtained in time
+"""
+
+from typing import Awaitable, Callable, TypeVar
+import asyncio
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class LLMCapacityError(Exception):
+    """Raised when no LLM capacity frees up before the acquire deadline"""
+    pass
+
+
+class LLMRateLimiter:
+    """
+    Semaphore + token-bucket limiter for outbound LLM requests
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_minute: int = 500,
+        acquire_timeout: float = 30.0,
+        max_retries: int = 3,
+        base_backoff: float = 1.0
+    ):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate = requests_per_minute / 60.0
+        self._capacity = float(max(1, requests_per_minute // 60))
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._bucket_lock = asyncio.Lock()
+        self.acquire_timeout = acquire_timeout
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+
+    async def _take_token(self) -> None:
+        """Wait until the bucket has a token, then consume it"""
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    @staticmethod
+    def _is_rate_limit_error(error: Exception) -> bool:
+        message = str(error).lower()
+        return "429" in message or "rate limit" in message or "ratelimit" in message
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an LLM call under the concurrency and rate limits
+
+        Args:
+            call: Zero-argument factory returning the awaitable to run
+                  (re-invoked on retry)
+
+        Raises:
+            LLMCapacityError: if a slot is not available within acquire_timeout
+        """
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise LLMCapacityError("LLM capacity exhausted, retry later")
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self._take_token()
+                try:
+                    return await call()
+                except Exception as e:
+                    if attempt == self.max_retries or not self._is_rate_limit_error(e):
+                        raise
+                    delay = self.base_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                    logger.warning(f"LLM rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                    await asyncio.sleep(delay)
+        finally:
+            self._semaphore.release()
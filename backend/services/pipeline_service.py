@@ -12,7 +12,8 @@ Automated screening and evaluation pipeline:
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 from enum import Enum
-import uuid
+from utils.ids import new_id
+from services.cache_service import cache_manager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -259,7 +260,7 @@ class ApplicationPipeline:
     ):
         """Log status change in audit log"""
         log_entry = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "application_id": application_id,
             "old_status": old_status,
             "new_status": new_status,
@@ -344,7 +345,7 @@ class ApplicationPipeline:
     ):
         """Create a notification for user"""
         notification = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "user_id": user_id,
             "title": title,
             "message": message,
@@ -388,6 +389,7 @@ class ApplicationPipeline:
                 {"id": referral["id"]},
                 {"$set": {"status": "hired"}}
             )
+            cache_manager.invalidate_leaderboard()
     
     async def schedule_interview(
         self,
@@ -407,7 +409,7 @@ class ApplicationPipeline:
         if not application:
             return {"error": "Application not found"}
         
-        interview_id = str(uuid.uuid4())
+        interview_id = new_id()
         interview = {
             "id": interview_id,
             "application_id": application_id,
@@ -0,0 +1,112 @@
+"""
+Bulk Writer tests
+HiringReferrals Platform
+"""
+
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from services.bulk_writer import BulkWriter
+
+
+class FakeCollection:
+    """Records each bulk_write batch; optionally rejects duplicate ids or holds writes open"""
+
+    name = "fake"
+
+    def __init__(self, duplicate_ids=(), gate: asyncio.Event = None):
+        self.duplicate_ids = set(duplicate_ids)
+        self.gate = gate
+        self.batches = []
+
+    async def bulk_write(self, operations, ordered=True):
+        assert ordered is False
+        documents = [op._doc for op in operations]
+        self.batches.append(documents)
+        if self.gate is not None:
+            await self.gate.wait()
+        errors = [
+            {"index": index, "code": 11000, "errmsg": f"E11000 duplicate key: {doc['id']}"}
+            for index, doc in enumerate(documents)
+            if doc["id"] in self.duplicate_ids
+        ]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+def test_duplicate_key_fails_only_its_own_insert():
+    async def scenario():
+        collection = FakeCollection(duplicate_ids={"b"})
+        writer = BulkWriter(collection)
+        results = await asyncio.gather(
+            writer.insert({"id": "a"}),
+            writer.insert({"id": "b"}),
+            writer.insert({"id": "c"}),
+            return_exceptions=True
+        )
+        await writer.close()
+        return collection, results
+
+    collection, results = asyncio.run(scenario())
+    assert [[doc["id"] for doc in batch] for batch in collection.batches] == [["a", "b", "c"]]
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], DuplicateKeyError)
+
+
+def test_close_drains_in_flight_and_queued_inserts():
+    async def scenario():
+        gate = asyncio.Event()
+        collection = FakeCollection(gate=gate)
+        writer = BulkWriter(collection)
+        first = asyncio.create_task(writer.insert({"id": "a"}))
+        # Let the lone insert reach bulk_write, where the gate holds it in flight
+        while not collection.batches:
+            await asyncio.sleep(0)
+        queued = [asyncio.create_task(writer.insert({"id": doc_id})) for doc_id in ("b", "c")]
+        await asyncio.sleep(0)
+
+        closing = asyncio.create_task(writer.close())
+        await asyncio.sleep(0)
+        assert not closing.done()
+        gate.set()
+        await asyncio.wait_for(closing, timeout=1)
+
+        inserts = [first, *queued]
+        assert all(task.done() and task.exception() is None for task in inserts)
+        return collection
+
+    collection = asyncio.run(scenario())
+    assert [[doc["id"] for doc in batch] for batch in collection.batches] == [["a"], ["b", "c"]]
+
+
+def test_lone_insert_does_not_wait_for_the_batch_window():
+    async def scenario():
+        collection = FakeCollection()
+        writer = BulkWriter(collection)
+        writer.BATCH_WINDOW = 60
+        await asyncio.wait_for(writer.insert({"id": "a"}), timeout=1)
+        await writer.close()
+        return collection
+
+    collection = asyncio.run(scenario())
+    assert collection.batches == [[{"id": "a"}]]
+
+
+@pytest.mark.parametrize("count", [BulkWriter.BATCH_SIZE, 2 * BulkWriter.BATCH_SIZE])
+def test_full_batches_flush_without_waiting_for_the_window(count):
+    async def scenario():
+        collection = FakeCollection()
+        writer = BulkWriter(collection)
+        writer.BATCH_WINDOW = 60
+        await asyncio.wait_for(
+            asyncio.gather(*[writer.insert({"id": str(i)}) for i in range(count)]),
+            timeout=1
+        )
+        await writer.close()
+        return collection
+
+    collection = asyncio.run(scenario())
+    assert BulkWriter.BATCH_SIZE == 500
+    assert [len(batch) for batch in collection.batches] == [500] * (count // 500)
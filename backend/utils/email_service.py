@@ -1,13 +1,24 @@
+import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
+# Queued by close(); the batch sender sends what came before it and exits
+_STOP = object()
+
 class EmailService:
     """Mock email service for testing - logs emails instead of sending"""
     
+    # Queued emails go out in batches of up to BATCH_SIZE, at most
+    # BATCH_WINDOW seconds after the first one was queued
+    BATCH_SIZE = 20
+    BATCH_WINDOW = 0.1
+    
     def __init__(self):
         self.logger = logging.getLogger("EmailService")
         self.sent_emails = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
     
     async def send_email(
         self,
@@ -34,15 +45,66 @@ class EmailService:
         
         return email_data
     
-    async def send_application_status_update(
+    async def send_many(self, emails: List[dict]) -> List[dict]:
+        """Send a batch of emails (a real transport reuses one connection)"""
+        return [await self.send_email(**email) for email in emails]
+    
+    def enqueue(self, to_email: str, subject: str, html_content: str) -> None:
+        """Queue an email for the batch sender and return immediately"""
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        self._queue.put_nowait({"to_email": to_email, "subject": subject, "html_content": html_content})
+    
+    async def _next_batch(self) -> Tuple[List[dict], bool]:
+        """The next batch to send, and whether close() asked the sender to stop"""
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.BATCH_WINDOW
+        while len(batch) < self.BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+    
+    async def _run(self):
+        while True:
+            batch, stop = await self._next_batch()
+            if batch:
+                try:
+                    await self.send_many(batch)
+                except Exception as e:
+                    self.logger.error(f"Failed to send {len(batch)} queued emails: {e}")
+            if stop:
+                return
+    
+    async def close(self):
+        """Stop the batch sender, sending whatever is still queued"""
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            self._queue.put_nowait(_STOP)
+            await self._worker
+        self._worker = None
+    
+    def render_application_status_update(
         self,
-        candidate_email: str,
         candidate_name: str,
         job_title: str,
         new_status: str,
         company_name: str
-    ):
-        """Send application status update email"""
+    ) -> Tuple[str, str]:
+        """Subject and HTML body of an application status update email"""
         subject = f"Application Update: {job_title} at {company_name}"
         
         html_content = f"""
@@ -77,6 +139,20 @@ class EmailService:
         </html>
         """
         
+        return subject, html_content
+    
+    async def send_application_status_update(
+        self,
+        candidate_email: str,
+        candidate_name: str,
+        job_title: str,
+        new_status: str,
+        company_name: str
+    ):
+        """Send application status update email"""
+        subject, html_content = self.render_application_status_update(
+            candidate_name, job_title, new_status, company_name
+        )
         return await self.send_email(candidate_email, subject, html_content)
     
     async def send_interview_invite(
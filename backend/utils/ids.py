@@ -0,0 +1,28 @@
+import os
+import time
+import uuid
+
+
+def _uuid7_int() -> int:
+    """128-bit RFC 9562 UUIDv7 value (48-bit ms timestamp + 74 random bits)"""
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76                        # version
+    value |= ((rand >> 62) & 0xFFF) << 64     # rand_a (12 bits)
+    value |= 0b10 << 62                       # variant
+    value |= rand & 0x3FFFFFFFFFFFFFFF        # rand_b (62 bits)
+    return value
+
+
+def uuid7() -> uuid.UUID:
+    """Generate an RFC 9562 UUIDv7"""
+    return uuid.UUID(int=_uuid7_int())
+
+
+def new_id() -> str:
+    """Time-ordered document id; inserts land at the right edge of the index"""
+    # Canonical dashed form, formatted directly rather than through a UUID object
+    h = f"{_uuid7_int():032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -111,3 +111,13 @@ class InvoiceGenerator:
         # Build PDF
         doc.build(story)
         return filepath
+
+
+_worker_generator = None
+
+def render_invoice_pdf(invoice_data: dict, output_dir: str = "/app/invoices") -> str:
+    """Process-pool entry point; each worker process builds its generator once"""
+    global _worker_generator
+    if _worker_generator is None or _worker_generator.output_dir != output_dir:
+        _worker_generator = InvoiceGenerator(output_dir)
+    return _worker_generator.generate_invoice(invoice_data)
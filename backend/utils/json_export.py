@@ -0,0 +1,42 @@
+import asyncio
+
+import orjson
+
+# Documents encoded and written per worker-thread hop
+WRITE_BATCH = 500
+
+
+def _write_batch(f, documents: list, first: bool) -> None:
+    """Encode documents as JSON array elements and append them to f (blocking)"""
+    for doc in documents:
+        f.write(b"\n" if first else b",\n")
+        # default=str covers ObjectId and other BSON-only types
+        f.write(orjson.dumps(doc, default=str))
+        first = False
+
+
+async def stream_json_array(path: str, cursor, batch_size: int = WRITE_BATCH) -> int:
+    """
+    Write a cursor to path as a JSON array, batch_size documents at a time,
+    so memory stays flat whatever the collection size. Encoding and file
+    writes run in a worker thread, keeping the event loop free for other
+    requests. Returns the number of documents written.
+    """
+    count = 0
+    batch = []
+    f = await asyncio.to_thread(open, path, "wb", 1 << 20)
+    try:
+        await asyncio.to_thread(f.write, b"[")
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                await asyncio.to_thread(_write_batch, f, batch, count == 0)
+                count += len(batch)
+                batch = []
+        if batch:
+            await asyncio.to_thread(_write_batch, f, batch, count == 0)
+            count += len(batch)
+        await asyncio.to_thread(f.write, b"\n]\n")
+    finally:
+        await asyncio.to_thread(f.close)
+    return count
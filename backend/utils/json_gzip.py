@@ -0,0 +1,101 @@
+import gzip
+import io
+
+from starlette.datastructures import Headers, MutableHeaders
+
+# API payloads worth compressing; file downloads (zip, PDF) already are
+COMPRESSIBLE_MEDIA_TYPES = frozenset({"application/json", "application/x-ndjson"})
+
+
+class JSONGZipMiddleware:
+    """
+    GZip for JSON/NDJSON API responses only.
+
+    Ranged requests, non-200 responses (206 partial content in particular)
+    and every other media type pass through untouched, so Content-Range and
+    Content-Length keep describing the bytes actually sent.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("accept-encoding", "") and "range" not in headers:
+                responder = _JSONGZipResponder(send, self.minimum_size, self.compresslevel)
+                await self.app(scope, receive, responder.send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _JSONGZipResponder:
+    """Decides on the response start message whether to compress the body"""
+
+    def __init__(self, send, minimum_size: int, compresslevel: int):
+        self._send = send
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.compress = False
+        self.start_message = None
+        self.buffer = io.BytesIO()
+        self.gzip_file = None
+
+    async def send(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip()
+            self.compress = (
+                message["status"] == 200
+                and media_type in COMPRESSIBLE_MEDIA_TYPES
+                and "content-encoding" not in headers
+            )
+            if self.compress:
+                # Held until the first body chunk shows whether it is worth it
+                self.start_message = message
+            else:
+                await self._send(message)
+            return
+
+        if message_type != "http.response.body" or not self.compress:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.minimum_size:
+                self.compress = False
+                await self._send(start)
+                await self._send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers.add_vary_header("Accept-Encoding")
+            self.gzip_file = gzip.GzipFile(mode="wb", fileobj=self.buffer, compresslevel=self.compresslevel)
+            data = self._compress(body, more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(data))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        data = self._compress(body, more_body)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        self.gzip_file.write(body)
+        if not more_body:
+            self.gzip_file.close()
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
@@ -0,0 +1,40 @@
+import fitz  # PyMuPDF: C-level text extraction
+from docx import Document
+
+# Only this much resume text is sent to the LLM
+RESUME_TEXT_LIMIT = 4000
+
+
+def join_capped(parts, max_chars: int, sep: str = "") -> str:
+    """Join text parts lazily, stopping once max_chars have been collected"""
+    collected = []
+    total = 0
+    for part in parts:
+        collected.append(part)
+        total += len(part) + len(sep)
+        if total >= max_chars:
+            break
+    return sep.join(collected)[:max_chars]
+
+
+def extract_pdf_text(path: str, max_chars: int = RESUME_TEXT_LIMIT) -> str:
+    """Extract up to max_chars of plain text from a PDF file"""
+    # Pages are extracted lazily, so pages past the cap are never parsed
+    with fitz.open(path, filetype="pdf") as pdf:
+        return join_capped((page.get_text("text") for page in pdf), max_chars, "\n")
+
+
+def extract_resume_text(path: str, file_name: str, max_chars: int = RESUME_TEXT_LIMIT) -> str:
+    """
+    Extract up to max_chars of text from a PDF, DOCX or plain-text resume file.
+    Top-level and free of app state so it can run in a worker process; only
+    the path crosses the process boundary, not the file bytes.
+    """
+    if file_name.endswith('.pdf'):
+        return extract_pdf_text(path, max_chars)
+    if file_name.endswith('.docx'):
+        doc = Document(path)
+        return join_capped((para.text + "\n" for para in doc.paragraphs), max_chars)
+    # A UTF-8 character is at most 4 bytes
+    with open(path, 'rb') as f:
+        return f.read(max_chars * 4).decode('utf-8', errors='ignore')[:max_chars]